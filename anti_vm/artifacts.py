@@ -15,12 +15,12 @@ appear like an actively used system.
 
 import os
 import random
-import sqlite3
 import time
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
-from datetime import datetime, timedelta
 
 
 @dataclass
@@ -155,16 +155,70 @@ COMMON_BASH_COMMANDS = [
     "exit",
 ]
 
+# Rows per multi-row INSERT (stays well under SQLite's 999 variable limit)
+INSERT_BATCH_ROWS = 100
+
+# Worker threads for parallel artifact file writes
+ARTIFACT_WRITE_WORKERS = 8
+
+# Minimal file headers, shared by every file that uses them
+ZIP_HEADER = b'PK\x03\x04' + bytes(100)  # Minimal DOCX/XLSX/PPTX/ZIP header
+PNG_HEADER = b'\x89PNG\r\n\x1a\n' + bytes(50)
+PE_HEADER = b'MZ' + bytes(100)
+PDF_HEADER = b'%PDF-1.4\n' + bytes(100)
+
+# Minimal valid JPEG (1x1 pixel red)
+MINIMAL_JPEG = bytes([
+    0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01,
+    0x01, 0x00, 0x00, 0x01, 0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43,
+    0x00, 0x08, 0x06, 0x06, 0x07, 0x06, 0x05, 0x08, 0x07, 0x07, 0x07, 0x09,
+    0x09, 0x08, 0x0A, 0x0C, 0x14, 0x0D, 0x0C, 0x0B, 0x0B, 0x0C, 0x19, 0x12,
+    0x13, 0x0F, 0x14, 0x1D, 0x1A, 0x1F, 0x1E, 0x1D, 0x1A, 0x1C, 0x1C, 0x20,
+    0x24, 0x2E, 0x27, 0x20, 0x22, 0x2C, 0x23, 0x1C, 0x1C, 0x28, 0x37, 0x29,
+    0x2C, 0x30, 0x31, 0x34, 0x34, 0x34, 0x1F, 0x27, 0x39, 0x3D, 0x38, 0x32,
+    0x3C, 0x2E, 0x33, 0x34, 0x32, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0x01,
+    0x00, 0x01, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0x1F, 0x00, 0x00,
+    0x01, 0x05, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08,
+    0x09, 0x0A, 0x0B, 0xFF, 0xC4, 0x00, 0xB5, 0x10, 0x00, 0x02, 0x01, 0x03,
+    0x03, 0x02, 0x04, 0x03, 0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D,
+    0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01, 0x00, 0x00, 0x3F, 0x00, 0xFB, 0xD5,
+    0xDB, 0x20, 0xBA, 0xA1, 0x02, 0xC6, 0xFF, 0xD9
+])
+
 # Document file templates
 DOCUMENT_TEMPLATES = {
-    'report.docx': b'PK\x03\x04' + b'\x00' * 100,  # Minimal DOCX header
-    'budget.xlsx': b'PK\x03\x04' + b'\x00' * 100,  # Minimal XLSX header
-    'presentation.pptx': b'PK\x03\x04' + b'\x00' * 100,
+    'report.docx': ZIP_HEADER,
+    'budget.xlsx': ZIP_HEADER,
+    'presentation.pptx': ZIP_HEADER,
     'notes.txt': b'Meeting notes\n\n- Discussed project timeline\n- Budget review\n- Next steps\n',
     'todo.txt': b'TODO List\n\n[ ] Complete report\n[ ] Review code\n[x] Send email\n',
     'readme.md': b'# Project\n\n## Description\n\nThis is a project readme.\n',
 }
 
+# (file name, content) tables for generated files
+WORK_DOCUMENTS = (
+    ("quarterly_report_2024.docx", DOCUMENT_TEMPLATES['report.docx']),
+    ("budget_2024.xlsx", DOCUMENT_TEMPLATES['budget.xlsx']),
+    ("presentation_final.pptx", DOCUMENT_TEMPLATES['presentation.pptx']),
+    ("meeting_notes.txt", DOCUMENT_TEMPLATES['notes.txt']),
+    ("project_plan.docx", DOCUMENT_TEMPLATES['report.docx']),
+)
+
+PERSONAL_DOCUMENTS = (
+    ("recipes.txt", b"Chocolate Cake Recipe\n\nIngredients:\n- 2 cups flour\n- 1 cup sugar\n"),
+    ("shopping_list.txt", b"Shopping List\n\n- Milk\n- Bread\n- Eggs\n- Butter\n"),
+    ("notes.txt", DOCUMENT_TEMPLATES['notes.txt']),
+)
+
+DOWNLOAD_FILES = (
+    ("installer.exe", PE_HEADER),
+    ("document.pdf", PDF_HEADER),
+    ("archive.zip", ZIP_HEADER),
+    ("data.csv", b'name,value,date\ntest,123,2024-01-01\n'),
+    ("readme.txt", b'Installation Instructions\n\n1. Run installer\n2. Follow prompts\n'),
+)
+
 
 class ArtifactsGenerator:
     """
@@ -173,13 +227,21 @@ class ArtifactsGenerator:
     
     def __init__(self, config: Optional[ArtifactsConfig] = None):
         self.config = config or ArtifactsConfig()
+        
+        # Directories already known to exist
+        self._ensured_dirs: set = set()
+        
+        # Width of the random timestamp window in seconds
+        self._range_seconds = self.config.date_range_days * 86400
     
     def generate_all(self):
         """Generate all artifacts"""
         self.create_directory_structure()
-        self.generate_documents()
-        self.generate_pictures()
-        self.generate_downloads()
+        
+        # Document, picture and download writes are independent small
+        # syscalls, so overlap them on a thread pool
+        files = self._document_files() + self._picture_files() + self._download_files()
+        self._write_files_parallel(files)
         
         if self.config.bash_history:
             self.generate_bash_history()
@@ -210,109 +272,84 @@ class ArtifactsGenerator:
         ]
         
         for d in directories:
-            (home / d).mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(home / d)
     
     def generate_documents(self):
         """Generate document files"""
+        for path, content in self._document_files():
+            self._write_file_with_random_time(path, content)
+    
+    def generate_pictures(self):
+        """Generate picture files (minimal valid JPEGs)"""
+        for path, content in self._picture_files():
+            self._write_file_with_random_time(path, content)
+    
+    def generate_downloads(self):
+        """Generate download files"""
+        for path, content in self._download_files():
+            self._write_file_with_random_time(path, content)
+    
+    def _document_files(self) -> List[Tuple[Path, bytes]]:
+        """Get document files to generate"""
         home = Path(self.config.home_dir)
         
-        docs_dir = home / "Documents"
         work_dir = home / "Documents/Work"
         personal_dir = home / "Documents/Personal"
         
-        # Work documents
-        work_files = [
-            ("quarterly_report_2024.docx", DOCUMENT_TEMPLATES['report.docx']),
-            ("budget_2024.xlsx", DOCUMENT_TEMPLATES['budget.xlsx']),
-            ("presentation_final.pptx", DOCUMENT_TEMPLATES['presentation.pptx']),
-            ("meeting_notes.txt", DOCUMENT_TEMPLATES['notes.txt']),
-            ("project_plan.docx", DOCUMENT_TEMPLATES['report.docx']),
-        ]
-        
-        for name, content in work_files:
-            self._write_file_with_random_time(work_dir / name, content)
-        
-        # Personal documents
-        personal_files = [
-            ("recipes.txt", b"Chocolate Cake Recipe\n\nIngredients:\n- 2 cups flour\n- 1 cup sugar\n"),
-            ("shopping_list.txt", b"Shopping List\n\n- Milk\n- Bread\n- Eggs\n- Butter\n"),
-            ("notes.txt", DOCUMENT_TEMPLATES['notes.txt']),
-        ]
+        files = [(work_dir / name, content) for name, content in WORK_DOCUMENTS]
+        files.extend((personal_dir / name, content) for name, content in PERSONAL_DOCUMENTS)
         
-        for name, content in personal_files:
-            self._write_file_with_random_time(personal_dir / name, content)
+        return files
     
-    def generate_pictures(self):
-        """Generate picture files (minimal valid JPEGs)"""
+    def _picture_files(self) -> List[Tuple[Path, bytes]]:
+        """Get picture files to generate"""
         home = Path(self.config.home_dir)
-        pics_dir = home / "Pictures"
         vacation_dir = home / "Pictures/Vacation"
-        
-        # Minimal valid JPEG (1x1 pixel red)
-        minimal_jpeg = bytes([
-            0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01,
-            0x01, 0x00, 0x00, 0x01, 0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43,
-            0x00, 0x08, 0x06, 0x06, 0x07, 0x06, 0x05, 0x08, 0x07, 0x07, 0x07, 0x09,
-            0x09, 0x08, 0x0A, 0x0C, 0x14, 0x0D, 0x0C, 0x0B, 0x0B, 0x0C, 0x19, 0x12,
-            0x13, 0x0F, 0x14, 0x1D, 0x1A, 0x1F, 0x1E, 0x1D, 0x1A, 0x1C, 0x1C, 0x20,
-            0x24, 0x2E, 0x27, 0x20, 0x22, 0x2C, 0x23, 0x1C, 0x1C, 0x28, 0x37, 0x29,
-            0x2C, 0x30, 0x31, 0x34, 0x34, 0x34, 0x1F, 0x27, 0x39, 0x3D, 0x38, 0x32,
-            0x3C, 0x2E, 0x33, 0x34, 0x32, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0x01,
-            0x00, 0x01, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0x1F, 0x00, 0x00,
-            0x01, 0x05, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00,
-            0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08,
-            0x09, 0x0A, 0x0B, 0xFF, 0xC4, 0x00, 0xB5, 0x10, 0x00, 0x02, 0x01, 0x03,
-            0x03, 0x02, 0x04, 0x03, 0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D,
-            0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01, 0x00, 0x00, 0x3F, 0x00, 0xFB, 0xD5,
-            0xDB, 0x20, 0xBA, 0xA1, 0x02, 0xC6, 0xFF, 0xD9
-        ])
-        
-        # Generate vacation photos
-        for i in range(min(5, self.config.num_pictures)):
-            self._write_file_with_random_time(
-                vacation_dir / f"IMG_{20230801 + i}.jpg",
-                minimal_jpeg
-            )
-        
-        # Generate screenshots
         screenshots_dir = home / "Pictures/Screenshots"
-        for i in range(3):
-            self._write_file_with_random_time(
-                screenshots_dir / f"Screenshot_{20240101 + i}.png",
-                b'\x89PNG\r\n\x1a\n' + b'\x00' * 50  # Minimal PNG header
-            )
-    
-    def generate_downloads(self):
-        """Generate download files"""
-        home = Path(self.config.home_dir)
-        downloads_dir = home / "Downloads"
         
+        # Vacation photos
         files = [
-            ("installer.exe", b'MZ' + b'\x00' * 100),  # Minimal PE header
-            ("document.pdf", b'%PDF-1.4\n' + b'\x00' * 100),
-            ("archive.zip", b'PK\x03\x04' + b'\x00' * 100),
-            ("data.csv", b'name,value,date\ntest,123,2024-01-01\n'),
-            ("readme.txt", b'Installation Instructions\n\n1. Run installer\n2. Follow prompts\n'),
+            (vacation_dir / f"IMG_{20230801 + i}.jpg", MINIMAL_JPEG)
+            for i in range(min(5, self.config.num_pictures))
         ]
         
-        for name, content in files:
-            self._write_file_with_random_time(downloads_dir / name, content)
+        # Screenshots
+        files.extend(
+            (screenshots_dir / f"Screenshot_{20240101 + i}.png", PNG_HEADER)
+            for i in range(3)
+        )
+        
+        return files
+    
+    def _download_files(self) -> List[Tuple[Path, bytes]]:
+        """Get download files to generate"""
+        downloads_dir = Path(self.config.home_dir) / "Downloads"
+        return [(downloads_dir / name, content) for name, content in DOWNLOAD_FILES]
+    
+    def _write_files_parallel(self, files: List[Tuple[Path, bytes]]):
+        """Write files with random modification times on a thread pool"""
+        # Directories and timestamps are prepared on the calling thread so
+        # the workers share no mutable state
+        for path, _ in files:
+            self._ensure_dir(path.parent)
+        
+        paths = [os.fspath(path) for path, _ in files]
+        contents = [content for _, content in files]
+        now = time.time()
+        mtimes = [self._random_time(now) for _ in files]
+        
+        with ThreadPoolExecutor(max_workers=ARTIFACT_WRITE_WORKERS) as executor:
+            # Consume results so worker exceptions propagate
+            list(executor.map(_write_file, paths, contents, mtimes))
     
     def generate_bash_history(self):
         """Generate bash history file"""
-        home = Path(self.config.home_dir)
-        history_file = home / ".bash_history"
+        history_file = Path(self.config.home_dir) / ".bash_history"
         
         # Generate random command history
-        commands = []
-        for _ in range(200):
-            cmd = random.choice(COMMON_BASH_COMMANDS)
-            commands.append(cmd)
+        content = ('\n'.join(random.choices(COMMON_BASH_COMMANDS, k=200)) + '\n').encode()
         
-        history_file.write_text('\n'.join(commands) + '\n')
-        
-        # Set reasonable mtime
-        self._set_random_time(history_file)
+        self._write_file_with_random_time(history_file, content)
     
     def generate_browser_history(self):
         """Generate browser history database"""
@@ -320,21 +357,42 @@ class ArtifactsGenerator:
         
         # Chromium history
         chromium_dir = home / ".config/chromium/Default"
-        chromium_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(chromium_dir)
         
         self._create_chrome_history(chromium_dir / "History")
         
         # Google Chrome history
         chrome_dir = home / ".config/google-chrome/Default"
-        chrome_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(chrome_dir)
         
         self._create_chrome_history(chrome_dir / "History")
     
     def _create_chrome_history(self, db_path: Path):
         """Create Chrome/Chromium history SQLite database"""
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
+        # Only needed here; keeps the C extension out of plain anti_vm imports
+        import sqlite3
         
+        # Autocommit mode: transactions are managed explicitly below
+        with closing(sqlite3.connect(str(db_path), isolation_level=None)) as conn:
+            # Throwaway spoof data - skip journal fsyncs during population
+            conn.executescript(
+                "PRAGMA journal_mode=MEMORY;"
+                "PRAGMA synchronous=OFF;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA locking_mode=EXCLUSIVE;"
+            )
+            
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                self._populate_chrome_history(cursor)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+    
+    def _populate_chrome_history(self, cursor):
+        """Create the history schema and fill it with entries"""
         # Create tables (simplified Chrome schema)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS urls (
@@ -372,44 +430,99 @@ class ArtifactsGenerator:
         
         # Generate history entries
         now = time.time()
-        day_seconds = 86400
         
-        for i in range(self.config.num_history_entries):
-            url, title = random.choice(COMMON_URLS)
-            
-            # Random time in the last N days
-            visit_time = now - random.randint(0, self.config.date_range_days * day_seconds)
-            # Chrome uses microseconds since Jan 1, 1601
-            chrome_time = int((visit_time + 11644473600) * 1000000)
-            
-            visit_count = random.randint(1, 20)
-            
-            cursor.execute(
-                "INSERT INTO urls (url, title, visit_count, last_visit_time) VALUES (?, ?, ?, ?)",
-                (url, title, visit_count, chrome_time)
-            )
-            url_id = cursor.lastrowid
-            
-            # Add visit record
-            cursor.execute(
-                "INSERT INTO visits (url, visit_time, visit_duration) VALUES (?, ?, ?)",
-                (url_id, chrome_time, random.randint(1000, 300000))
-            )
+        # Assign url ids up front so visits can reference them without
+        # a per-row lastrowid round trip
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM urls")
+        next_id = cursor.fetchone()[0] + 1
         
-        conn.commit()
-        conn.close()
+        # Draw all random values up front instead of per entry
+        n = self.config.num_history_entries
+        range_seconds = self._range_seconds + 1
+        randrange = random.randrange
+        picked = random.choices(COMMON_URLS, k=n)
+        offsets = [randrange(range_seconds) for _ in range(n)]
+        visit_counts = [randrange(1, 21) for _ in range(n)]
+        durations = [randrange(1000, 300001) for _ in range(n)]
+        
+        # Chrome uses microseconds since Jan 1, 1601
+        chrome_times = [int((now - offset + 11644473600) * 1000000) for offset in offsets]
+        url_ids = range(next_id, next_id + n)
+        
+        urls_rows = [
+            (url_id, url, title, visit_count, chrome_time)
+            for url_id, (url, title), visit_count, chrome_time
+            in zip(url_ids, picked, visit_counts, chrome_times)
+        ]
+        visits_rows = list(zip(url_ids, chrome_times, durations))
+        
+        self._bulk_populate(cursor, urls_rows, visits_rows)
+        
+        # Build indexes once over the filled tables rather than updating
+        # them row by row (same index names as Chrome's real schema)
+        cursor.execute("CREATE INDEX IF NOT EXISTS urls_url_index ON urls (url)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS visits_url_index ON visits (url)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS visits_time_index ON visits (visit_time)")
+    
+    def _bulk_populate(self, cursor, urls_rows: List[Tuple], visits_rows: List[Tuple]):
+        """Insert history rows into the urls and visits tables"""
+        self._insert_rows(
+            cursor,
+            "INSERT INTO urls (id, url, title, visit_count, last_visit_time) VALUES ",
+            urls_rows
+        )
+        self._insert_rows(
+            cursor,
+            "INSERT INTO visits (url, visit_time, visit_duration) VALUES ",
+            visits_rows
+        )
+    
+    def _insert_rows(self, cursor, sql_prefix: str, rows: List[Tuple]):
+        """Insert rows using multi-row VALUES statements"""
+        if not rows:
+            return
+        
+        placeholder = "(" + ", ".join(["?"] * len(rows[0])) + ")"
+        
+        for start in range(0, len(rows), INSERT_BATCH_ROWS):
+            chunk = rows[start:start + INSERT_BATCH_ROWS]
+            params = [value for row in chunk for value in row]
+            cursor.execute(sql_prefix + ", ".join([placeholder] * len(chunk)), params)
     
     def _write_file_with_random_time(self, path: Path, content: bytes):
         """Write file with random modification time"""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(content)
-        self._set_random_time(path)
+        self._ensure_dir(path.parent)
+        _write_file(os.fspath(path), content, self._random_time())
     
-    def _set_random_time(self, path: Path):
-        """Set random modification time on file"""
-        now = time.time()
-        random_time = now - random.randint(0, self.config.date_range_days * 86400)
-        os.utime(path, (random_time, random_time))
+    def _ensure_dir(self, path: Path):
+        """Create directory once; later calls for it or its parents are no-ops"""
+        if path in self._ensured_dirs:
+            return
+        
+        path.mkdir(parents=True, exist_ok=True)
+        
+        self._ensured_dirs.add(path)
+        self._ensured_dirs.update(path.parents)
+    
+    def _random_time(self, now: Optional[float] = None) -> float:
+        """Get a random timestamp within the configured date range"""
+        if now is None:
+            now = time.time()
+        return now - random.random() * self._range_seconds
+
+
+def _write_file(path: str, content: bytes, mtime: float):
+    """Write file and set its timestamps through a single descriptor"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+        if os.utime in os.supports_fd:
+            os.utime(fd, (mtime, mtime))
+    finally:
+        os.close(fd)
+    
+    if os.utime not in os.supports_fd:
+        os.utime(path, (mtime, mtime))
 
 
 def generate_user_artifacts(home_dir: str = "/home/user",
@@ -9,6 +9,7 @@ The CPUID instruction is commonly used by malware to detect virtual environments
 This module provides QEMU arguments to mask these indicators.
 """
 
+from functools import lru_cache
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -20,7 +21,7 @@ class CPUVendor(Enum):
     AMD = "AuthenticAMD"
 
 
-@dataclass
+@dataclass(frozen=True)
 class CPUIDConfig:
     """CPUID masking configuration"""
     
@@ -95,8 +96,15 @@ class CPUIDMasker:
         'hv_stimer_direct',
     ]
     
+    # Precomputed "-feature" tokens for disabling the above
+    _KVM_DISABLE = tuple(f"-{feat}" for feat in KVM_FEATURES)
+    _HV_DISABLE = tuple(f"-{feat}" for feat in HYPERV_FEATURES)
+    
     def __init__(self, config: Optional[CPUIDConfig] = None):
         self.config = config or CPUIDConfig()
+        
+        # The config is frozen, so the -cpu spec never changes
+        self._x86_cpu_spec = self._build_x86_cpu_spec()
     
     def get_cpu_model_flags(self, architecture: str = "x86_64") -> List[str]:
         """
@@ -114,8 +122,10 @@ class CPUIDMasker:
     
     def _get_x86_flags(self) -> List[str]:
         """Generate x86_64 CPU flags"""
-        flags = []
-        
+        return ["-cpu", self._x86_cpu_spec]
+    
+    def _build_x86_cpu_spec(self) -> str:
+        """Build the x86_64 -cpu specification string"""
         # Base CPU model - use a realistic model
         # For TCG (software emulation), we use qemu64 as base
         base_model = "qemu64"
@@ -129,12 +139,10 @@ class CPUIDMasker:
         
         # Disable KVM paravirt features
         if self.config.disable_pv_features:
-            for feat in self.KVM_FEATURES:
-                features.append(f"-{feat}")
+            features.extend(self._KVM_DISABLE)
         
         # Disable Hyper-V features
-        for feat in self.HYPERV_FEATURES:
-            features.append(f"-{feat}")
+        features.extend(self._HV_DISABLE)
         
         # Add common CPU features to look realistic
         realistic_features = [
@@ -155,21 +163,14 @@ class CPUIDMasker:
         if features:
             cpu_spec += "," + ",".join(features)
         
-        flags.extend(["-cpu", cpu_spec])
-        
-        return flags
+        return cpu_spec
     
     def _get_arm64_flags(self) -> List[str]:
         """Generate ARM64 CPU flags"""
-        flags = []
-        
         # For KVM on ARM, use 'host' to pass through real CPU
         # For TCG, use 'max' for maximum compatibility
         # ARM doesn't have a hypervisor bit like x86
-        
-        flags.extend(["-cpu", "max"])
-        
-        return flags
+        return ["-cpu", "max"]
     
     def get_machine_flags(self, architecture: str = "x86_64", use_kvm: bool = False) -> List[str]:
         """
@@ -182,33 +183,34 @@ class CPUIDMasker:
         Returns:
             List of machine-related QEMU arguments
         """
-        flags = []
-        
-        if architecture == "aarch64":
-            # ARM virtual machine
-            machine = "virt"
-            if use_kvm:
-                machine += ",accel=kvm"
-                # Additional settings to hide KVM on ARM
-                machine += ",gic-version=3"
-            else:
-                machine += ",accel=tcg"
-            flags.extend(["-machine", machine])
+        return ["-machine", _machine_spec(architecture, use_kvm)]
+
+
+@lru_cache(maxsize=None)
+def _machine_spec(architecture: str, use_kvm: bool) -> str:
+    """Build the -machine specification string"""
+    if architecture == "aarch64":
+        # ARM virtual machine
+        machine = "virt"
+        if use_kvm:
+            machine += ",accel=kvm"
+            # Additional settings to hide KVM on ARM
+            machine += ",gic-version=3"
         else:
-            # x86 machine - use Q35 chipset (modern Intel)
-            machine = "q35"
-            if use_kvm:
-                # Even with KVM, we hide it
-                machine += ",accel=kvm,kernel_irqchip=on"
-            else:
-                machine += ",accel=tcg"
-            
-            # Disable HPET (can be used for timing detection)
-            machine += ",hpet=off"
-            
-            flags.extend(["-machine", machine])
+            machine += ",accel=tcg"
+    else:
+        # x86 machine - use Q35 chipset (modern Intel)
+        machine = "q35"
+        if use_kvm:
+            # Even with KVM, we hide it
+            machine += ",accel=kvm,kernel_irqchip=on"
+        else:
+            machine += ",accel=tcg"
         
-        return flags
+        # Disable HPET (can be used for timing detection)
+        machine += ",hpet=off"
+    
+    return machine
 
 
 def get_cpuid_args(architecture: str = "x86_64", 
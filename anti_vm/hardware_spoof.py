@@ -10,25 +10,85 @@ Malware checks various hardware identifiers to detect virtual environments:
 This module provides realistic hardware identifiers.
 """
 
-import random
+import os
 import string
-from typing import List, Dict, Optional, Tuple
+import sys
+import threading
+from functools import cached_property, partial
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 
 # Realistic MAC address OUI prefixes (first 3 bytes)
 # These are from real hardware manufacturers
-MAC_OUI_PREFIXES: Dict[str, List[str]] = {
-    'dell': ['D4:BE:D9', '18:03:73', '34:17:EB', 'F8:DB:88', '00:14:22'],
-    'hp': ['94:57:A5', '00:21:5A', '38:63:BB', '3C:D9:2B', '00:1E:0B'],
-    'lenovo': ['00:06:1B', '7C:7A:91', '6C:C2:17', '68:F7:28', '98:FA:9B'],
-    'intel': ['00:1B:21', '00:1E:67', '00:15:17', '00:1C:BF', '00:13:E8'],
-    'realtek': ['00:E0:4C', '52:54:00', '00:0A:CD', '4C:ED:FB', '00:40:F4'],
-    'broadcom': ['00:10:18', '00:1A:2B', '00:24:D6', '60:33:4B', '44:94:FC'],
-    'samsung': ['00:12:47', '00:21:4C', '84:25:DB', 'F0:1F:AF', '94:35:0A'],
-    'asus': ['00:1D:60', '00:15:F2', '2C:4D:54', '40:16:7E', 'E0:3F:49'],
+MAC_OUI_PREFIXES: Dict[str, Tuple[str, ...]] = {
+    'dell': ('D4:BE:D9', '18:03:73', '34:17:EB', 'F8:DB:88', '00:14:22'),
+    'hp': ('94:57:A5', '00:21:5A', '38:63:BB', '3C:D9:2B', '00:1E:0B'),
+    'lenovo': ('00:06:1B', '7C:7A:91', '6C:C2:17', '68:F7:28', '98:FA:9B'),
+    'intel': ('00:1B:21', '00:1E:67', '00:15:17', '00:1C:BF', '00:13:E8'),
+    'realtek': ('00:E0:4C', '52:54:00', '00:0A:CD', '4C:ED:FB', '00:40:F4'),
+    'broadcom': ('00:10:18', '00:1A:2B', '00:24:D6', '60:33:4B', '44:94:FC'),
+    'samsung': ('00:12:47', '00:21:4C', '84:25:DB', 'F0:1F:AF', '94:35:0A'),
+    'asus': ('00:1D:60', '00:15:F2', '2C:4D:54', '40:16:7E', 'E0:3F:49'),
 }
 
+# OUI prefixes pre-parsed into raw 3-byte strings
+_OUI_BYTES: Dict[str, Tuple[bytes, ...]] = {
+    vendor: tuple(bytes.fromhex(oui.replace(':', '')) for oui in ouis)
+    for vendor, ouis in MAC_OUI_PREFIXES.items()
+}
+
+# Serial number alphabets
+_ALNUM = string.ascii_uppercase + string.digits
+_UPPER = string.ascii_uppercase
+
+
+def _byte_lut(alphabet: str) -> bytes:
+    """Build a bytes.translate table mapping every byte value into an alphabet"""
+    return bytes(ord(alphabet[b % len(alphabet)]) for b in range(256))
+
+
+# Uppercase alphanumeric table, shared with smbios_spoof
+ALNUM_LUT = _byte_lut(_ALNUM)
+_UPPER_LUT = _byte_lut(_UPPER)
+
+# Per-thread block of random bytes, refilled from os.urandom
+_RAND_BLOCK_SIZE = 4096
+_tls = threading.local()
+
+
+def _rand_bytes(n: int) -> bytes:
+    """Get n random bytes from the thread-local cache"""
+    buf = getattr(_tls, 'buf', b'')
+    pos = getattr(_tls, 'pos', 0)
+    
+    if pos + n > len(buf):
+        buf = os.urandom(max(_RAND_BLOCK_SIZE, n))
+        pos = 0
+        _tls.buf = buf
+    
+    _tls.pos = pos + n
+    return buf[pos:pos + n]
+
+
+def _rand_str(lut: bytes, k: int) -> str:
+    """Get k random characters mapped through a translate table"""
+    # translate maps the whole buffer in one C-level pass
+    return _rand_bytes(k).translate(lut).decode('ascii')
+
+
+def _rand_digits(k: int) -> str:
+    """Get k random decimal digits decoded from a single random integer"""
+    # k bytes give 256**k >> 10**k, so the modulo bias is negligible
+    return '%0*d' % (k, int.from_bytes(_rand_bytes(k), 'little') % 10 ** k)
+
+
+def _format_mac(raw: bytes) -> str:
+    """Format 6 raw bytes as a colon-separated uppercase MAC"""
+    # bytes.hex does the per-octet formatting and separators in C
+    return raw.hex(':').upper()
+
+
 # Disk serial number prefixes for different manufacturers
 DISK_SERIAL_PREFIXES: Dict[str, str] = {
     'western_digital': 'WD-WCAV',
@@ -42,7 +102,72 @@ DISK_SERIAL_PREFIXES: Dict[str, str] = {
 }
 
 
-@dataclass
+# Templates for arguments that embed generated identifiers
+DRIVE_FMT = 'file=%s,if=none,id=%s,format=qcow2,serial=%s'
+NETDEV_PREFIX = sys.intern('virtio-net-pci,netdev=net0,mac=')
+
+
+def _gen_western_digital(prefix: str) -> str:
+    """WD format: WD-WCAV + 8 alphanumeric"""
+    return prefix + _rand_str(ALNUM_LUT, 8)
+
+
+def _gen_seagate(prefix: str) -> str:
+    """Seagate format: ST + 8 digits + 3 letters"""
+    return prefix + _rand_digits(8) + _rand_str(_UPPER_LUT, 3)
+
+
+def _gen_samsung(prefix: str) -> str:
+    """Samsung format: S + model + serial"""
+    return prefix + _rand_digits(3) + 'NX' + _rand_digits(7)
+
+
+def _gen_default(prefix: str) -> str:
+    """Generic format: vendor prefix + 12 alphanumeric"""
+    return prefix + _rand_str(ALNUM_LUT, 12)
+
+
+# Vendors with their own serial layout; others fall back to _gen_default
+_SERIAL_GEN: Dict[str, Callable[[str], str]] = {
+    'western_digital': _gen_western_digital,
+    'seagate': _gen_seagate,
+    'samsung': _gen_samsung,
+}
+
+
+# Static device arguments
+USB_ARGS = (
+    # USB controller
+    '-device', 'qemu-xhci,id=xhci',
+    # Keyboard (looks like real USB keyboard)
+    '-device', 'usb-kbd,id=kbd0',
+    # Mouse
+    '-device', 'usb-mouse,id=mouse0',
+    # Tablet (for better mouse tracking)
+    '-device', 'usb-tablet,id=tablet0',
+)
+
+# Intel HDA (High Definition Audio) - common in real PCs
+AUDIO_ARGS = (
+    '-device', 'intel-hda',
+    '-device', 'hda-duplex',
+)
+
+# Random number generator (looks like real hardware)
+RNG_ARGS = ('-device', 'virtio-rng-pci')
+
+_DISPLAY_ARGS: Dict[str, Tuple[str, ...]] = {
+    'none': ('-display', 'none', '-nographic'),
+    'vnc': ('-vnc', ':0'),
+    'gtk': ('-display', 'gtk'),
+    'spice': (
+        '-spice', 'port=5930,disable-ticketing=on',
+        '-device', 'qxl-vga',
+    ),
+}
+
+
+@dataclass(slots=True)
 class HardwareConfig:
     """Hardware spoofing configuration"""
     
@@ -74,57 +199,85 @@ class HardwareSpoofer:
     
     def __init__(self, config: Optional[HardwareConfig] = None):
         self.config = config or HardwareConfig()
+        
+        # Resolve the vendor-specific serial format once
+        vendor = self.config.disk_vendor
+        self._serial_fn = partial(
+            _SERIAL_GEN.get(vendor, _gen_default),
+            DISK_SERIAL_PREFIXES.get(vendor, 'WD-WCAV'),
+        )
+        
+        # Fixed identifiers skip the generators entirely
+        custom_mac = self.config.custom_mac
+        if custom_mac:
+            self.generate_mac_address = lambda: custom_mac
+        custom_serial = self.config.custom_disk_serial
+        if custom_serial:
+            self.generate_disk_serial = lambda: custom_serial
+    
+    @cached_property
+    def mac(self) -> str:
+        """MAC address for this spoofer, generated on first access"""
+        return self.generate_mac_address()
+    
+    @cached_property
+    def serial(self) -> str:
+        """Disk serial for this spoofer, generated on first access"""
+        return self.generate_disk_serial()
+    
+    def reset(self):
+        """Drop cached identifiers so the next access re-randomizes them"""
+        self.__dict__.pop('mac', None)
+        self.__dict__.pop('serial', None)
     
     def generate_mac_address(self) -> str:
         """Generate a realistic MAC address"""
-        if self.config.custom_mac:
-            return self.config.custom_mac
+        # One draw covers the OUI pick (2 bytes) and device portion (3 bytes)
+        raw = _rand_bytes(5)
         
         # Get OUI prefix from vendor
-        oui_list = MAC_OUI_PREFIXES.get(self.config.mac_vendor, MAC_OUI_PREFIXES['intel'])
-        oui = random.choice(oui_list)
-        
-        # Generate random device portion (last 3 bytes)
-        device_bytes = [random.randint(0, 255) for _ in range(3)]
-        device_part = ':'.join(f'{b:02X}' for b in device_bytes)
+        oui_list = _OUI_BYTES.get(self.config.mac_vendor, _OUI_BYTES['intel'])
+        oui = oui_list[int.from_bytes(raw[:2], 'big') % len(oui_list)]
         
-        return f"{oui}:{device_part}"
+        return _format_mac(oui + raw[2:])
     
     def generate_disk_serial(self) -> str:
         """Generate a realistic disk serial number"""
-        if self.config.custom_disk_serial:
-            return self.config.custom_disk_serial
+        return self._serial_fn()
+    
+    def generate_macs(self, n: int) -> List[str]:
+        """Generate n MAC addresses from one block of random bytes"""
+        if self.config.custom_mac:
+            return [self.config.custom_mac] * n
         
-        prefix = DISK_SERIAL_PREFIXES.get(self.config.disk_vendor, 'WD-WCAV')
+        oui_list = _OUI_BYTES.get(self.config.mac_vendor, _OUI_BYTES['intel'])
+        count = len(oui_list)
+        raw = _rand_bytes(5 * n)
         
-        # Different formats for different vendors
-        if self.config.disk_vendor == 'western_digital':
-            # WD format: WD-WCAV + 8 alphanumeric
-            suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        elif self.config.disk_vendor == 'seagate':
-            # Seagate format: ST + 8 digits + 3 letters
-            suffix = ''.join(random.choices(string.digits, k=8))
-            suffix += ''.join(random.choices(string.ascii_uppercase, k=3))
-        elif self.config.disk_vendor == 'samsung':
-            # Samsung format: S + model + serial
-            suffix = ''.join(random.choices(string.digits, k=3))
-            suffix += 'NX' + ''.join(random.choices(string.digits, k=7))
-        else:
-            suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+        macs = []
+        for i in range(0, 5 * n, 5):
+            oui = oui_list[int.from_bytes(raw[i:i + 2], 'big') % count]
+            macs.append(_format_mac(oui + raw[i + 2:i + 5]))
+        
+        return macs
+    
+    def generate_serials(self, n: int) -> List[str]:
+        """Generate n disk serial numbers"""
+        if self.config.custom_disk_serial:
+            return [self.config.custom_disk_serial] * n
         
-        return f"{prefix}{suffix}"
+        serial_fn = self._serial_fn
+        return [serial_fn() for _ in range(n)]
     
     def get_network_args(self, network_enabled: bool = False) -> List[str]:
         """Generate network device arguments"""
         args = []
         
-        mac = self.generate_mac_address()
-        
         if network_enabled:
             # User-mode networking with realistic MAC
             args.extend([
                 '-netdev', 'user,id=net0',
-                '-device', f'virtio-net-pci,netdev=net0,mac={mac}'
+                '-device', NETDEV_PREFIX + self.mac
             ])
         else:
             # No network, but still define NIC with realistic MAC
@@ -137,64 +290,26 @@ class HardwareSpoofer:
         """Generate storage device arguments"""
         args = []
         
-        serial = self.generate_disk_serial()
-        
         # Use IDE for more realistic appearance (SATA/AHCI)
         # virtio is faster but more detectable
         args.extend([
-            '-drive', f'file={image_path},if=none,id={drive_id},format=qcow2,serial={serial}',
-            '-device', f'ide-hd,drive={drive_id},bus=ide.0'
+            '-drive', DRIVE_FMT % (image_path, drive_id, self.serial),
+            '-device', 'ide-hd,drive=%s,bus=ide.0' % drive_id
         ])
         
         return args
     
     def get_usb_args(self) -> List[str]:
         """Generate USB device arguments"""
-        args = []
-        
-        # USB controller
-        args.extend(['-device', 'qemu-xhci,id=xhci'])
-        
-        # Keyboard (looks like real USB keyboard)
-        args.extend(['-device', 'usb-kbd,id=kbd0'])
-        
-        # Mouse
-        args.extend(['-device', 'usb-mouse,id=mouse0'])
-        
-        # Tablet (for better mouse tracking)
-        args.extend(['-device', 'usb-tablet,id=tablet0'])
-        
-        return args
+        return list(USB_ARGS)
     
     def get_audio_args(self) -> List[str]:
         """Generate audio device arguments"""
-        args = []
-        
-        # Intel HDA (High Definition Audio) - common in real PCs
-        args.extend([
-            '-device', 'intel-hda',
-            '-device', 'hda-duplex'
-        ])
-        
-        return args
+        return list(AUDIO_ARGS)
     
     def get_display_args(self, display_type: str = 'none') -> List[str]:
         """Generate display arguments"""
-        args = []
-        
-        if display_type == 'none':
-            args.extend(['-display', 'none', '-nographic'])
-        elif display_type == 'vnc':
-            args.extend(['-vnc', ':0'])
-        elif display_type == 'gtk':
-            args.extend(['-display', 'gtk'])
-        elif display_type == 'spice':
-            args.extend([
-                '-spice', 'port=5930,disable-ticketing=on',
-                '-device', 'qxl-vga'
-            ])
-        
-        return args
+        return list(_DISPLAY_ARGS.get(display_type, ()))
     
     def get_all_args(self, image_path: str, network_enabled: bool = False,
                      display_type: str = 'none') -> List[str]:
@@ -206,9 +321,7 @@ class HardwareSpoofer:
         args.extend(self.get_usb_args())
         args.extend(self.get_audio_args())
         args.extend(self.get_display_args(display_type))
-        
-        # Random number generator (looks like real hardware)
-        args.extend(['-device', 'virtio-rng-pci'])
+        args.extend(RNG_ARGS)
         
         return args
 
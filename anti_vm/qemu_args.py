@@ -5,16 +5,19 @@ This module provides a unified interface to build QEMU command-line
 arguments with all anti-VM detection countermeasures applied.
 """
 
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
 
 from .cpuid_mask import CPUIDMasker, CPUIDConfig
-from .smbios_spoof import SMBIOSSpoofer, SMBIOS_PROFILES
+from .smbios_spoof import SMBIOSSpoofer
 from .hardware_spoof import HardwareSpoofer, HardwareConfig
+from .hardware_spoof import DRIVE_FMT, NETDEV_PREFIX, USB_ARGS, AUDIO_ARGS, RNG_ARGS
 from .timing_fix import TimingFixer, TimingConfig, get_timing_cpu_flags
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AntiVMQEMUConfig:
     """Configuration for anti-VM QEMU setup"""
     
@@ -93,126 +96,61 @@ class QEMUArgsBuilder:
     
     def build_args(self) -> List[str]:
         """Build complete QEMU command arguments"""
-        args = []
-        
-        # QEMU binary
-        if self.config.architecture == "aarch64":
-            args.append("qemu-system-aarch64")
-        else:
-            args.append("qemu-system-x86_64")
-        
-        # Machine and CPU
-        args.extend(self._build_machine_args())
-        args.extend(self._build_cpu_args())
-        
-        # Memory
-        args.extend(["-m", str(self.config.ram_mb)])
-        
-        # SMP
-        args.extend(["-smp", str(self.config.cpus)])
-        
-        # SMBIOS
-        if self.config.architecture == "x86_64":
-            args.extend(self.smbios_spoofer.get_qemu_args())
-        
-        # Storage
-        if self.config.disk_image:
-            args.extend(self._build_storage_args())
-        
-        # Network
-        args.extend(self._build_network_args())
-        
-        # Display
-        args.extend(self._build_display_args())
-        
-        # USB and audio
-        args.extend(self._build_device_args())
-        
-        # Timing
-        args.extend(self.timing_fixer.get_all_timing_args())
-        
-        # Communication sockets
-        args.extend(self._build_socket_args())
+        config = self.config
+        x86 = config.architecture == "x86_64"
+        
+        fragments = (
+            # QEMU binary
+            ("qemu-system-aarch64" if config.architecture == "aarch64"
+             else "qemu-system-x86_64",),
+            # Machine and CPU
+            self._build_machine_args(),
+            self._build_cpu_args(),
+            # Memory and SMP
+            ("-m", str(config.ram_mb)),
+            ("-smp", str(config.cpus)),
+            # SMBIOS
+            self.smbios_spoofer.get_qemu_args() if x86 else (),
+            # Storage
+            self._build_storage_args() if config.disk_image else (),
+            # Network
+            self._build_network_args(),
+            # Display
+            self._build_display_args(),
+            # USB and audio
+            self._build_device_args(),
+            # Timing
+            self.timing_fixer.get_all_timing_args(),
+            # Communication sockets
+            self._build_socket_args(),
+        )
         
-        return args
+        # Single pass over all fragments instead of repeated extends
+        return list(chain.from_iterable(fragments))
     
     def _build_machine_args(self) -> List[str]:
         """Build machine type arguments"""
-        args = []
-        
-        if self.config.architecture == "aarch64":
-            machine = "virt"
-            if self.config.use_kvm:
-                machine += ",accel=kvm,gic-version=3"
-            else:
-                machine += ",accel=tcg"
-            args.extend(["-machine", machine])
-        else:
-            machine = "q35"
-            if self.config.use_kvm:
-                machine += ",accel=kvm"
-            else:
-                machine += ",accel=tcg"
-            
-            # Disable HPET for timing reasons
-            machine += ",hpet=off"
-            
-            args.extend(["-machine", machine])
-        
-        return args
+        return list(_machine_args(self.config.architecture, self.config.use_kvm))
     
     def _build_cpu_args(self) -> List[str]:
         """Build CPU arguments with anti-detection"""
-        args = []
-        
-        if self.config.architecture == "aarch64":
-            if self.config.use_kvm:
-                args.extend(["-cpu", "host"])
-            else:
-                args.extend(["-cpu", "max"])
-        else:
-            # x86_64
-            cpu_flags = ["qemu64"]
-            
-            # Hide hypervisor
-            if self.config.hide_hypervisor:
-                cpu_flags.append("-hypervisor")
-            
-            # Hide KVM features
-            if self.config.hide_kvm_features:
-                kvm_features = [
-                    "kvm_pv_eoi", "kvm_pv_unhalt", "kvm_steal_time",
-                    "kvmclock", "kvmclock-stable-bit"
-                ]
-                for feat in kvm_features:
-                    cpu_flags.append(f"-{feat}")
-            
-            # Timing features
-            if self.config.stabilize_timing:
-                cpu_flags.extend(get_timing_cpu_flags(
-                    stabilize=True,
-                    tsc_frequency=self.config.tsc_frequency
-                ))
-            
-            # Realistic CPU features
-            realistic_features = [
-                "+sse4.1", "+sse4.2", "+ssse3", "+popcnt",
-                "+avx", "+aes", "+pclmulqdq"
-            ]
-            cpu_flags.extend(realistic_features)
-            
-            args.extend(["-cpu", ",".join(cpu_flags)])
-        
-        return args
+        return list(_cpu_args(
+            self.config.architecture,
+            self.config.use_kvm,
+            self.config.hide_hypervisor,
+            self.config.hide_kvm_features,
+            self.config.stabilize_timing,
+            self.config.tsc_frequency,
+        ))
     
     def _build_storage_args(self) -> List[str]:
         """Build storage arguments"""
         args = []
         
-        serial = self.hardware_spoofer.generate_disk_serial()
+        serial = self.hardware_spoofer.serial
         
         args.extend([
-            "-drive", f"file={self.config.disk_image},if=none,id=disk0,format=qcow2,serial={serial}",
+            "-drive", DRIVE_FMT % (self.config.disk_image, "disk0", serial),
         ])
         
         if self.config.architecture == "aarch64":
@@ -227,12 +165,12 @@ class QEMUArgsBuilder:
         """Build network arguments"""
         args = []
         
-        mac = self.hardware_spoofer.generate_mac_address()
+        mac = self.hardware_spoofer.mac
         
         if self.config.network_enabled:
             args.extend([
                 "-netdev", "user,id=net0",
-                "-device", f"virtio-net-pci,netdev=net0,mac={mac}"
+                "-device", NETDEV_PREFIX + mac
             ])
         else:
             args.extend(["-nic", "none"])
@@ -241,72 +179,139 @@ class QEMUArgsBuilder:
     
     def _build_display_args(self) -> List[str]:
         """Build display arguments"""
-        args = []
-        
-        if self.config.display == "none":
-            args.extend(["-display", "none", "-nographic"])
-        elif self.config.display == "vnc":
-            args.extend(["-vnc", f":{self.config.vnc_display}"])
-        elif self.config.display == "gtk":
-            args.extend(["-display", "gtk"])
-        elif self.config.display == "spice":
-            port = 5930 + self.config.vnc_display
-            args.extend([
-                "-spice", f"port={port},disable-ticketing=on",
-                "-device", "qxl-vga"
-            ])
-        
-        return args
+        return list(_display_args(self.config.display, self.config.vnc_display))
     
     def _build_device_args(self) -> List[str]:
         """Build device emulation arguments"""
-        args = []
-        
-        # USB controller and devices
-        args.extend(["-device", "qemu-xhci,id=xhci"])
-        args.extend(["-device", "usb-kbd,id=kbd0"])
-        args.extend(["-device", "usb-mouse,id=mouse0"])
-        args.extend(["-device", "usb-tablet,id=tablet0"])
-        
-        # Audio
-        args.extend(["-device", "intel-hda"])
-        args.extend(["-device", "hda-duplex"])
-        
-        # RNG
-        args.extend(["-device", "virtio-rng-pci"])
-        
-        return args
+        return [*USB_ARGS, *AUDIO_ARGS, *RNG_ARGS]
     
     def _build_socket_args(self) -> List[str]:
         """Build communication socket arguments"""
-        args = []
-        
-        # QMP monitor
-        if self.config.monitor_socket:
-            args.extend(["-qmp", f"unix:{self.config.monitor_socket},server,nowait"])
-        
-        # Serial console
-        if self.config.serial_socket:
-            args.extend([
-                "-chardev", f"socket,id=serial0,path={self.config.serial_socket},server=on,wait=off",
-                "-serial", "chardev:serial0"
-            ])
-        
-        # Guest agent (virtio-serial)
-        if self.config.agent_socket:
-            args.extend([
-                "-device", "virtio-serial-pci",
-                "-chardev", f"socket,id=agent0,path={self.config.agent_socket},server=on,wait=off",
-                "-device", "virtserialport,chardev=agent0,name=org.sandbox.agent"
-            ])
-        
-        return args
+        return list(_socket_args(
+            self.config.monitor_socket,
+            self.config.serial_socket,
+            self.config.agent_socket,
+        ))
     
     def get_command_string(self) -> str:
         """Get the complete command as a string"""
         return ' '.join(self.build_args())
 
 
+# The argument groups below are pure functions of a few config fields,
+# so they are memoized and shared between builders with the same settings
+
+@lru_cache(maxsize=128)
+def _machine_args(architecture: str, use_kvm: bool) -> Tuple[str, ...]:
+    """Build machine type arguments"""
+    if architecture == "aarch64":
+        machine = "virt"
+        if use_kvm:
+            machine += ",accel=kvm,gic-version=3"
+        else:
+            machine += ",accel=tcg"
+    else:
+        machine = "q35"
+        if use_kvm:
+            machine += ",accel=kvm"
+        else:
+            machine += ",accel=tcg"
+        
+        # Disable HPET for timing reasons
+        machine += ",hpet=off"
+    
+    return ("-machine", machine)
+
+
+@lru_cache(maxsize=128)
+def _cpu_args(architecture: str, use_kvm: bool, hide_hypervisor: bool,
+              hide_kvm_features: bool, stabilize_timing: bool,
+              tsc_frequency: int) -> Tuple[str, ...]:
+    """Build CPU arguments with anti-detection"""
+    if architecture == "aarch64":
+        if use_kvm:
+            return ("-cpu", "host")
+        return ("-cpu", "max")
+    
+    # x86_64
+    cpu_flags = ["qemu64"]
+    
+    # Hide hypervisor
+    if hide_hypervisor:
+        cpu_flags.append("-hypervisor")
+    
+    # Hide KVM features
+    if hide_kvm_features:
+        kvm_features = [
+            "kvm_pv_eoi", "kvm_pv_unhalt", "kvm_steal_time",
+            "kvmclock", "kvmclock-stable-bit"
+        ]
+        for feat in kvm_features:
+            cpu_flags.append(f"-{feat}")
+    
+    # Timing features
+    if stabilize_timing:
+        cpu_flags.extend(get_timing_cpu_flags(
+            stabilize=True,
+            tsc_frequency=tsc_frequency
+        ))
+    
+    # Realistic CPU features
+    realistic_features = [
+        "+sse4.1", "+sse4.2", "+ssse3", "+popcnt",
+        "+avx", "+aes", "+pclmulqdq"
+    ]
+    cpu_flags.extend(realistic_features)
+    
+    return ("-cpu", ",".join(cpu_flags))
+
+
+@lru_cache(maxsize=128)
+def _display_args(display: str, vnc_display: int) -> Tuple[str, ...]:
+    """Build display arguments"""
+    if display == "none":
+        return ("-display", "none", "-nographic")
+    if display == "vnc":
+        return ("-vnc", f":{vnc_display}")
+    if display == "gtk":
+        return ("-display", "gtk")
+    if display == "spice":
+        port = 5930 + vnc_display
+        return (
+            "-spice", f"port={port},disable-ticketing=on",
+            "-device", "qxl-vga"
+        )
+    return ()
+
+
+@lru_cache(maxsize=128)
+def _socket_args(monitor_socket: Optional[str], serial_socket: Optional[str],
+                 agent_socket: Optional[str]) -> Tuple[str, ...]:
+    """Build communication socket arguments"""
+    args = []
+    
+    # QMP monitor
+    if monitor_socket:
+        args.extend(["-qmp", f"unix:{monitor_socket},server,nowait"])
+    
+    # Serial console
+    if serial_socket:
+        args.extend([
+            "-chardev", f"socket,id=serial0,path={serial_socket},server=on,wait=off",
+            "-serial", "chardev:serial0"
+        ])
+    
+    # Guest agent (virtio-serial)
+    if agent_socket:
+        args.extend([
+            "-device", "virtio-serial-pci",
+            "-chardev", f"socket,id=agent0,path={agent_socket},server=on,wait=off",
+            "-device", "virtserialport,chardev=agent0,name=org.sandbox.agent"
+        ])
+    
+    return tuple(args)
+
+
 def build_anti_vm_args(
     architecture: str = "x86_64",
     disk_image: str = "",
@@ -12,14 +12,126 @@ This module generates fake sensor data to make the VM look like real hardware.
 """
 
 import os
-import random
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
-from pathlib import Path
 
 
-@dataclass
+# Worker threads for parallel sysfs file writes
+SYSFS_WRITE_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Thermal zone trip points (cooling thresholds)
+TRIP_POINTS = (
+    (b"60000", b"passive"),
+    (b"75000", b"active"),
+    (b"90000", b"critical"),
+)
+
+# Trip point files are identical for every zone
+_TRIP_POINT_FILES = tuple(
+    entry
+    for j, (temp, trip_type) in enumerate(TRIP_POINTS)
+    for entry in ((f"trip_point_{j}_temp", temp), (f"trip_point_{j}_type", trip_type))
+)
+
+# Motherboard (nct6775) temperature and voltage channels
+BOARD_TEMPS = (
+    (b"SYSTIN", 35000),
+    (b"CPUTIN", 45000),
+    (b"AUXTIN0", 30000),
+    (b"AUXTIN1", 28000),
+    (b"AUXTIN2", 27000),
+)
+
+BOARD_VOLTAGES = (
+    (b"Vcore", 1100),
+    (b"in1", 1000),
+    (b"+3.3V", 3312),
+    (b"+5V", 5040),
+    (b"+12V", 12096),
+)
+
+# Number of coretemp cores exposed under hwmon0
+CPU_CORES = 4
+
+# Files whose content never depends on the configuration
+_STATIC_FILES: Tuple[Tuple[str, bytes], ...] = (
+    ("class/hwmon/hwmon0/name", b"coretemp"),
+    *(
+        entry
+        for i in range(CPU_CORES)
+        for entry in (
+            (f"class/hwmon/hwmon0/temp{i+1}_label", b"Core %d" % i),
+            (f"class/hwmon/hwmon0/temp{i+1}_max", b"100000"),
+            (f"class/hwmon/hwmon0/temp{i+1}_crit", b"110000"),
+        )
+    ),
+    ("class/hwmon/hwmon1/name", b"dell_smm"),
+    ("class/hwmon/hwmon2/name", b"nct6775"),  # Common Nuvoton chip
+    *((f"class/hwmon/hwmon2/temp{i+1}_label", label) for i, (label, _) in enumerate(BOARD_TEMPS)),
+    *((f"class/hwmon/hwmon2/in{i}_label", label) for i, (label, _) in enumerate(BOARD_VOLTAGES)),
+    ("class/power_supply/AC/type", b"Mains"),
+    ("devices/virtual/input/input0/name", b"AT Translated Set 2 keyboard"),
+    ("devices/virtual/input/input0/phys", b"isa0060/serio0/input0"),
+    ("devices/virtual/input/input1/name", b"Logitech USB Receiver"),
+    ("devices/virtual/input/input1/phys", b"usb-0000:00:14.0-1/input0"),
+    ("devices/virtual/input/mice", b""),
+)
+
+# Per-zone files under class/thermal/thermal_zone{i}/
+_ZONE_FILES = (
+    ("temp", lambda tz: b"%d" % tz.get_temp()),
+    ("type", lambda tz: tz.name.encode()),
+    ("policy", lambda tz: tz.policy.encode()),
+    ("mode", lambda tz: b"enabled"),
+)
+
+# Per-fan files under class/hwmon/hwmon1/ (formatted with the fan number)
+_FAN_FILES = (
+    ("fan%d_input", lambda fan: b"%d" % fan.get_rpm()),
+    ("fan%d_label", lambda fan: fan.label.encode()),
+    ("fan%d_max", lambda fan: b"%d" % fan.max_rpm),
+)
+
+# Battery files under class/power_supply/BAT0/
+_BATTERY_FILES = (
+    ("type", lambda bat: b"Battery"),
+    ("status", lambda bat: bat.status.encode()),
+    ("present", lambda bat: b"1"),
+    ("technology", lambda bat: bat.technology.encode()),
+    ("capacity", lambda bat: b"%d" % bat.capacity_percent),
+    ("capacity_level", lambda bat: b"Normal"),
+    ("manufacturer", lambda bat: bat.manufacturer.encode()),
+    ("model_name", lambda bat: bat.model_name.encode()),
+    ("energy_full", lambda bat: b"%d" % bat.energy_full),
+    ("energy_now", lambda bat: b"%d" % bat.get_energy_now()),
+    ("energy_full_design", lambda bat: b"%d" % bat.energy_full),
+    ("voltage_now", lambda bat: b"%d" % bat.voltage_now),
+    ("voltage_min_design", lambda bat: b"10800000"),
+)
+
+# Tiny LCG for sensor jitter; these are cosmetic values, not secrets
+_lcg_state = [os.getpid() ^ time.time_ns()]
+
+
+def _rand_range(lo: int, hi: int) -> int:
+    """Return a pseudo-random integer in [lo, hi]"""
+    s = (_lcg_state[0] * 1103515245 + 12345) & 0x7fffffff
+    _lcg_state[0] = s
+    return lo + s % (hi - lo + 1)
+
+
+def _write_file(path: str, data: bytes):
+    """Write a small sysfs-style file with a single open/write/close"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+@dataclass(frozen=True, slots=True)
 class ThermalZone:
     """Thermal zone configuration"""
     name: str = "x86_pkg_temp"
@@ -29,11 +141,11 @@ class ThermalZone:
     
     def get_temp(self) -> int:
         """Get current temperature in millidegrees"""
-        temp = self.base_temp + random.randint(-self.variance // 2, self.variance)
+        temp = self.base_temp + _rand_range(-self.variance // 2, self.variance)
         return temp * 1000  # Convert to millidegrees
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FanSensor:
     """Fan sensor configuration"""
     name: str = "dell_smm"
@@ -44,10 +156,10 @@ class FanSensor:
     
     def get_rpm(self) -> int:
         """Get current fan speed"""
-        return self.base_rpm + random.randint(-self.variance // 2, self.variance)
+        return self.base_rpm + _rand_range(-self.variance // 2, self.variance)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BatteryInfo:
     """Battery information for laptop emulation"""
     manufacturer: str = "Dell"
@@ -63,7 +175,7 @@ class BatteryInfo:
         return int(self.energy_full * self.capacity_percent / 100)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SensorsConfig:
     """Complete sensors configuration"""
     
@@ -86,6 +198,121 @@ class SensorsConfig:
     ac_online: bool = True
 
 
+# Python updater that jitters the fake sensor values in place
+UPDATE_SCRIPT = '''#!/usr/bin/env python3
+"""Update fake sensor values periodically"""
+
+import glob
+import os
+import random
+import signal
+import sys
+
+SYSFS_BASE = sys.argv[1] if len(sys.argv) > 1 else "/opt/anti_vm/fake_sysfs"
+UPDATE_INTERVAL = 30
+
+# (glob pattern, default value, jitter, min, max)
+SENSORS = (
+    ("class/thermal/thermal_zone*/temp", 45000, 1500, 35000, 75000),
+    ("class/hwmon/hwmon*/fan*_input", 2400, 100, 1000, 5000),
+    ("class/hwmon/hwmon0/temp*_input", 45000, 1000, 35000, 85000),
+)
+
+BATTERY = os.path.join(SYSFS_BASE, "class/power_supply/BAT0")
+
+# Sensor files stay open across update passes
+FDS = {}
+
+
+def open_fd(path):
+    """Open a sensor file once and reuse the fd on later calls"""
+    fd = FDS.get(path)
+    if fd is None:
+        fd = FDS[path] = os.open(path, os.O_RDWR)
+    return fd
+
+
+def close_all():
+    """Close every sensor fd"""
+    for fd in FDS.values():
+        os.close(fd)
+    FDS.clear()
+
+
+def read_int(fd, default):
+    """Read the integer stored in a sensor file"""
+    try:
+        return int(os.pread(fd, 32, 0) or default)
+    except ValueError:
+        return default
+
+
+def write_int(fd, value):
+    """Overwrite a sensor file with a new integer"""
+    data = b"%d" % value
+    os.pwrite(fd, data, 0)
+    os.ftruncate(fd, len(data))
+
+
+def open_sensors():
+    """Open every sensor file once for the lifetime of the updater"""
+    sensors = []
+    for pattern, default, jitter, low, high in SENSORS:
+        for path in sorted(glob.glob(os.path.join(SYSFS_BASE, pattern))):
+            sensors.append((open_fd(path), default, jitter, low, high))
+    return sensors
+
+
+def open_battery():
+    """Open battery energy/capacity files if a battery is present"""
+    try:
+        return tuple(
+            open_fd(os.path.join(BATTERY, name))
+            for name in ("energy_now", "energy_full", "capacity")
+        )
+    except OSError:
+        return None
+
+
+def update_sensors(sensors, battery):
+    """Apply one round of jitter to all sensors"""
+    for fd, default, jitter, low, high in sensors:
+        value = read_int(fd, default) + random.randrange(-jitter, jitter)
+        write_int(fd, min(max(value, low), high))
+    
+    # Slowly discharge the battery
+    if battery:
+        now_fd, full_fd, capacity_fd = battery
+        now = max(read_int(now_fd, 0) - 10000, 0)
+        write_int(now_fd, now)
+        full = read_int(full_fd, 0)
+        if full:
+            write_int(capacity_fd, now * 100 // full)
+
+
+def main():
+    # Stop signals are blocked and waited on together with the tick,
+    # so shutdown wakes the loop immediately instead of after a sleep
+    stop = {signal.SIGTERM, signal.SIGINT}
+    signal.pthread_sigmask(signal.SIG_BLOCK, stop)
+    
+    sensors = open_sensors()
+    battery = open_battery()
+    
+    try:
+        while True:
+            update_sensors(sensors, battery)
+            if signal.sigtimedwait(stop, UPDATE_INTERVAL) is not None:
+                break
+    finally:
+        close_all()
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
 class SensorsFaker:
     """
     Generates fake sensor data for sysfs.
@@ -104,163 +331,98 @@ class SensorsFaker:
         Args:
             base_path: Base directory for fake sysfs
         """
-        base = Path(base_path)
+        base = os.fspath(base_path) + "/"
         
-        # Create directory structure
-        dirs = [
-            "class/thermal",
-            "class/hwmon",
-            "class/power_supply",
-            "devices/virtual/input",
-        ]
-        
-        for d in dirs:
-            (base / d).mkdir(parents=True, exist_ok=True)
-        
-        # Create thermal zones
-        self._create_thermal_zones(base)
+        # Create the whole directory tree in one pass
+        for d in self._sysfs_dirs():
+            os.makedirs(base + d, exist_ok=True)
         
-        # Create hwmon entries
-        self._create_hwmon(base)
+        files = list(self._sysfs_files())
+        paths = [base + rel for rel, _ in files]
+        contents = [data for _, data in files]
         
-        # Create power supply entries
-        self._create_power_supply(base)
-        
-        # Create input devices
-        self._create_input_devices(base)
+        # os.write releases the GIL, so independent files write in parallel
+        with ThreadPoolExecutor(max_workers=SYSFS_WRITE_WORKERS) as executor:
+            # Consume results so worker exceptions propagate
+            list(executor.map(_write_file, paths, contents))
     
-    def _create_thermal_zones(self, base: Path):
-        """Create thermal zone entries"""
-        thermal_base = base / "class/thermal"
+    def create_sysfs_archive(self, archive_path: str):
+        """
+        Pack the fake sysfs tree into a tar archive.
         
-        for i, tz in enumerate(self.config.thermal_zones):
-            zone_dir = thermal_base / f"thermal_zone{i}"
-            zone_dir.mkdir(exist_ok=True)
-            
-            # Temperature
-            (zone_dir / "temp").write_text(str(tz.get_temp()))
-            
-            # Type
-            (zone_dir / "type").write_text(tz.name)
-            
-            # Policy
-            (zone_dir / "policy").write_text(tz.policy)
-            
-            # Mode
-            (zone_dir / "mode").write_text("enabled")
+        The archive is written sequentially in one pass and can be
+        unpacked inside the guest with a single tar invocation.
+        
+        Args:
+            archive_path: Output .tar path
+        """
+        import io
+        import tarfile
+        
+        now = time.time()
+        
+        with tarfile.open(archive_path, "w") as tar:
+            for d in self._sysfs_dirs():
+                info = tarfile.TarInfo(d)
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                info.mtime = now
+                tar.addfile(info)
             
-            # Trip points (cooling thresholds)
-            for j, temp in enumerate([60000, 75000, 90000]):
-                (zone_dir / f"trip_point_{j}_temp").write_text(str(temp))
-                (zone_dir / f"trip_point_{j}_type").write_text(
-                    ["passive", "active", "critical"][j]
-                )
+            for rel, data in self._sysfs_files():
+                info = tarfile.TarInfo(rel)
+                info.size = len(data)
+                info.mode = 0o644
+                info.mtime = now
+                tar.addfile(info, io.BytesIO(data))
     
-    def _create_hwmon(self, base: Path):
-        """Create hardware monitoring entries"""
-        hwmon_base = base / "class/hwmon"
+    def _sysfs_dirs(self) -> List[str]:
+        """List every leaf directory of the fake sysfs tree"""
+        dirs = ["class/thermal"]
+        dirs += [f"class/thermal/thermal_zone{i}" for i in range(len(self.config.thermal_zones))]
+        dirs += ["class/hwmon/hwmon0", "class/hwmon/hwmon1", "class/hwmon/hwmon2"]
+        dirs.append("class/power_supply/AC")
+        if self.config.battery:
+            dirs.append("class/power_supply/BAT0")
+        dirs += ["devices/virtual/input/input0", "devices/virtual/input/input1"]
+        return dirs
+    
+    def _sysfs_files(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield (relative path, content) for every file of the fake sysfs tree"""
+        config = self.config
         
-        # Temperature sensors (coretemp-like)
-        hwmon0 = hwmon_base / "hwmon0"
-        hwmon0.mkdir(exist_ok=True)
+        yield from _STATIC_FILES
         
-        (hwmon0 / "name").write_text("coretemp")
+        # Thermal zones
+        for i, tz in enumerate(config.thermal_zones):
+            zone = f"class/thermal/thermal_zone{i}/"
+            for name, value in _ZONE_FILES:
+                yield (zone + name, value(tz))
+            for name, value in _TRIP_POINT_FILES:
+                yield (zone + name, value)
         
-        for i in range(4):  # 4 CPU cores
-            temp = 45000 + random.randint(-3000, 5000)
-            (hwmon0 / f"temp{i+1}_input").write_text(str(temp))
-            (hwmon0 / f"temp{i+1}_label").write_text(f"Core {i}")
-            (hwmon0 / f"temp{i+1}_max").write_text("100000")
-            (hwmon0 / f"temp{i+1}_crit").write_text("110000")
+        # Core temperatures (coretemp-like)
+        for i in range(CPU_CORES):
+            yield (f"class/hwmon/hwmon0/temp{i+1}_input", b"%d" % (45000 + _rand_range(-3000, 5000)))
         
         # Fan sensors
-        hwmon1 = hwmon_base / "hwmon1"
-        hwmon1.mkdir(exist_ok=True)
-        
-        (hwmon1 / "name").write_text("dell_smm")
+        for i, fan in enumerate(config.fans):
+            for name, value in _FAN_FILES:
+                yield ("class/hwmon/hwmon1/" + name % (i + 1), value(fan))
         
-        for i, fan in enumerate(self.config.fans):
-            (hwmon1 / f"fan{i+1}_input").write_text(str(fan.get_rpm()))
-            (hwmon1 / f"fan{i+1}_label").write_text(fan.label)
-            (hwmon1 / f"fan{i+1}_max").write_text(str(fan.max_rpm))
-        
-        # Additional hwmon for motherboard sensors
-        hwmon2 = hwmon_base / "hwmon2"
-        hwmon2.mkdir(exist_ok=True)
-        
-        (hwmon2 / "name").write_text("nct6775")  # Common Nuvoton chip
-        
-        # Various temps
-        for i, (label, temp) in enumerate([
-            ("SYSTIN", 35000),
-            ("CPUTIN", 45000),
-            ("AUXTIN0", 30000),
-            ("AUXTIN1", 28000),
-            ("AUXTIN2", 27000),
-        ]):
-            (hwmon2 / f"temp{i+1}_input").write_text(str(temp + random.randint(-2000, 2000)))
-            (hwmon2 / f"temp{i+1}_label").write_text(label)
-        
-        # Voltages
-        for i, (label, mv) in enumerate([
-            ("Vcore", 1100),
-            ("in1", 1000),
-            ("+3.3V", 3312),
-            ("+5V", 5040),
-            ("+12V", 12096),
-        ]):
-            (hwmon2 / f"in{i}_input").write_text(str(mv + random.randint(-20, 20)))
-            (hwmon2 / f"in{i}_label").write_text(label)
-    
-    def _create_power_supply(self, base: Path):
-        """Create power supply entries"""
-        ps_base = base / "class/power_supply"
+        # Motherboard temperatures and voltages
+        for i, (_, temp) in enumerate(BOARD_TEMPS):
+            yield (f"class/hwmon/hwmon2/temp{i+1}_input", b"%d" % (temp + _rand_range(-2000, 2000)))
+        for i, (_, mv) in enumerate(BOARD_VOLTAGES):
+            yield (f"class/hwmon/hwmon2/in{i}_input", b"%d" % (mv + _rand_range(-20, 20)))
         
         # AC adapter
-        ac_dir = ps_base / "AC"
-        ac_dir.mkdir(exist_ok=True)
-        
-        (ac_dir / "type").write_text("Mains")
-        (ac_dir / "online").write_text("1" if self.config.ac_online else "0")
+        yield ("class/power_supply/AC/online", b"1" if config.ac_online else b"0")
         
         # Battery (if configured)
-        if self.config.battery:
-            bat = self.config.battery
-            bat_dir = ps_base / "BAT0"
-            bat_dir.mkdir(exist_ok=True)
-            
-            (bat_dir / "type").write_text("Battery")
-            (bat_dir / "status").write_text(bat.status)
-            (bat_dir / "present").write_text("1")
-            (bat_dir / "technology").write_text(bat.technology)
-            (bat_dir / "capacity").write_text(str(bat.capacity_percent))
-            (bat_dir / "capacity_level").write_text("Normal")
-            (bat_dir / "manufacturer").write_text(bat.manufacturer)
-            (bat_dir / "model_name").write_text(bat.model_name)
-            (bat_dir / "energy_full").write_text(str(bat.energy_full))
-            (bat_dir / "energy_now").write_text(str(bat.get_energy_now()))
-            (bat_dir / "energy_full_design").write_text(str(bat.energy_full))
-            (bat_dir / "voltage_now").write_text(str(bat.voltage_now))
-            (bat_dir / "voltage_min_design").write_text("10800000")
-    
-    def _create_input_devices(self, base: Path):
-        """Create input device entries"""
-        input_base = base / "devices/virtual/input"
-        
-        # Keyboard
-        kbd_dir = input_base / "input0"
-        kbd_dir.mkdir(exist_ok=True)
-        (kbd_dir / "name").write_text("AT Translated Set 2 keyboard")
-        (kbd_dir / "phys").write_text("isa0060/serio0/input0")
-        
-        # Mouse
-        mouse_dir = input_base / "input1"
-        mouse_dir.mkdir(exist_ok=True)
-        (mouse_dir / "name").write_text("Logitech USB Receiver")
-        (mouse_dir / "phys").write_text("usb-0000:00:14.0-1/input0")
-        
-        # Create mice symlink target
-        (input_base / "mice").touch()
+        if config.battery:
+            for name, value in _BATTERY_FILES:
+                yield ("class/power_supply/BAT0/" + name, value(config.battery))
     
     def generate_update_script(self) -> str:
         """
@@ -269,105 +431,44 @@ class SensorsFaker:
         This makes the sensor values change over time, which is more realistic
         than static values.
         """
-        script = '''#!/bin/bash
-# Update fake sensor values periodically
-
-SYSFS_BASE="${1:-/opt/anti_vm/fake_sysfs}"
-
-update_sensors() {
-    # Update thermal zones
-    for zone in "$SYSFS_BASE"/class/thermal/thermal_zone*/temp; do
-        if [ -f "$zone" ]; then
-            base=$(cat "$zone")
-            base=${base:-45000}
-            variance=$((RANDOM % 3000 - 1500))
-            new_temp=$((base + variance))
-            # Keep in reasonable range
-            [ $new_temp -lt 35000 ] && new_temp=35000
-            [ $new_temp -gt 75000 ] && new_temp=75000
-            echo $new_temp > "$zone" 2>/dev/null
-        fi
-    done
-    
-    # Update fan speeds
-    for fan in "$SYSFS_BASE"/class/hwmon/hwmon*/fan*_input; do
-        if [ -f "$fan" ]; then
-            base=$(cat "$fan")
-            base=${base:-2400}
-            variance=$((RANDOM % 200 - 100))
-            new_rpm=$((base + variance))
-            [ $new_rpm -lt 1000 ] && new_rpm=1000
-            [ $new_rpm -gt 5000 ] && new_rpm=5000
-            echo $new_rpm > "$fan" 2>/dev/null
-        fi
-    done
-    
-    # Update CPU temps
-    for temp in "$SYSFS_BASE"/class/hwmon/hwmon0/temp*_input; do
-        if [ -f "$temp" ]; then
-            base=$(cat "$temp")
-            base=${base:-45000}
-            variance=$((RANDOM % 2000 - 1000))
-            new_temp=$((base + variance))
-            [ $new_temp -lt 35000 ] && new_temp=35000
-            [ $new_temp -gt 85000 ] && new_temp=85000
-            echo $new_temp > "$temp" 2>/dev/null
-        fi
-    done
-    
-    # Update battery if present
-    bat_now="$SYSFS_BASE/class/power_supply/BAT0/energy_now"
-    if [ -f "$bat_now" ]; then
-        current=$(cat "$bat_now")
-        # Slowly decrease (discharging)
-        new_val=$((current - 10000))
-        [ $new_val -lt 0 ] && new_val=0
-        echo $new_val > "$bat_now" 2>/dev/null
-        
-        # Update capacity
-        full="$SYSFS_BASE/class/power_supply/BAT0/energy_full"
-        if [ -f "$full" ]; then
-            full_val=$(cat "$full")
-            capacity=$((new_val * 100 / full_val))
-            echo $capacity > "$SYSFS_BASE/class/power_supply/BAT0/capacity" 2>/dev/null
-        fi
-    fi
-}
-
-# Run update loop
-while true; do
-    update_sensors
-    sleep 30
-done
-'''
-        return script
+        return UPDATE_SCRIPT
     
     def get_mount_commands(self) -> List[str]:
         """
         Get commands to mount fake sysfs over real sysfs.
         
         These commands should be run at boot with appropriate privileges.
+        A single read-only overlay stacks the fake class tree above the
+        real /sys/class. Kernels that refuse sysfs as an overlay layer
+        fall back to the per-directory bind mounts, which are skipped
+        once the overlay is in place.
         """
         base = "/opt/anti_vm/fake_sysfs"
-        commands = []
+        commands = [
+            f"mount -t overlay overlay -o lowerdir={base}/class:/sys/class /sys/class 2>/dev/null || true",
+        ]
+        
+        # Fallback bind mounts (only when the overlay did not mount)
+        binds = []
         
         # Mount thermal zones
         for i in range(len(self.config.thermal_zones)):
-            src = f"{base}/class/thermal/thermal_zone{i}"
-            dst = f"/sys/class/thermal/thermal_zone{i}"
-            commands.append(f"mount --bind {src} {dst} 2>/dev/null || true")
+            binds.append(f"thermal/thermal_zone{i}")
         
         # Mount hwmon
         for i in range(3):
-            src = f"{base}/class/hwmon/hwmon{i}"
-            dst = f"/sys/class/hwmon/hwmon{i}"
-            commands.append(f"mount --bind {src} {dst} 2>/dev/null || true")
+            binds.append(f"hwmon/hwmon{i}")
         
         # Mount power supply
-        commands.append(f"mount --bind {base}/class/power_supply/AC /sys/class/power_supply/AC 2>/dev/null || true")
+        binds.append("power_supply/AC")
         
         if self.config.battery:
-            commands.append(f"mount --bind {base}/class/power_supply/BAT0 /sys/class/power_supply/BAT0 2>/dev/null || true")
+            binds.append("power_supply/BAT0")
+        
+        for rel in binds:
+            commands.append(
+                f"mountpoint -q /sys/class || mount --bind {base}/class/{rel} /sys/class/{rel} 2>/dev/null || true"
+            )
         
         return commands
 
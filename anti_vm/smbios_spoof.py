@@ -12,14 +12,31 @@ malware often checks to detect virtual environments:
 This module provides realistic SMBIOS profiles from real hardware.
 """
 
+import os
 import random
-import string
-import uuid
-from typing import List, Dict, Optional
-from dataclasses import dataclass, field
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, List, Dict, Optional
+from dataclasses import dataclass, field, replace
 
+from .hardware_spoof import ALNUM_LUT
 
-@dataclass
+
+def _randstr(k: int) -> str:
+    """Get k random uppercase alphanumeric characters"""
+    return os.urandom(k).translate(ALNUM_LUT).decode('ascii')
+
+
+def _fast_uuid() -> str:
+    """Random (version 4) UUID string built straight from os.urandom"""
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+@dataclass(frozen=True, slots=True)
 class SMBIOSProfile:
     """Complete SMBIOS profile for a system"""
     
@@ -57,9 +74,9 @@ class SMBIOSProfile:
     processor_serial: str = ""
 
 
-# Realistic SMBIOS profiles from real hardware
-SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
-    'dell_optiplex': SMBIOSProfile(
+# Realistic SMBIOS profiles from real hardware (SMBIOSProfile keyword arguments)
+_RAW_PROFILES: Dict[str, Dict[str, Any]] = {
+    'dell_optiplex': dict(
         bios_vendor="Dell Inc.",
         bios_version="A12",
         bios_date="03/15/2023",
@@ -77,7 +94,7 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
         processor_version="Intel(R) Core(TM) i7-10700 CPU @ 2.90GHz",
     ),
     
-    'dell_latitude': SMBIOSProfile(
+    'dell_latitude': dict(
         bios_vendor="Dell Inc.",
         bios_version="1.15.0",
         bios_date="05/10/2023",
@@ -95,7 +112,7 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
         processor_version="11th Gen Intel(R) Core(TM) i5-1145G7 @ 2.60GHz",
     ),
     
-    'hp_prodesk': SMBIOSProfile(
+    'hp_prodesk': dict(
         bios_vendor="HP",
         bios_version="S14 Ver. 02.09.00",
         bios_date="05/20/2023",
@@ -113,7 +130,7 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
         processor_version="Intel(R) Core(TM) i5-10500 CPU @ 3.10GHz",
     ),
     
-    'hp_elitebook': SMBIOSProfile(
+    'hp_elitebook': dict(
         bios_vendor="HP",
         bios_version="T76 Ver. 01.12.00",
         bios_date="04/15/2023",
@@ -131,7 +148,7 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
         processor_version="11th Gen Intel(R) Core(TM) i7-1165G7 @ 2.80GHz",
     ),
     
-    'lenovo_thinkcentre': SMBIOSProfile(
+    'lenovo_thinkcentre': dict(
         bios_vendor="LENOVO",
         bios_version="M3CKT49A",
         bios_date="01/10/2023",
@@ -149,7 +166,7 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
         processor_version="Intel(R) Core(TM) i7-9700T CPU @ 2.00GHz",
     ),
     
-    'lenovo_thinkpad': SMBIOSProfile(
+    'lenovo_thinkpad': dict(
         bios_vendor="LENOVO",
         bios_version="N33ET69W (1.50)",
         bios_date="06/01/2023",
@@ -167,7 +184,7 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
         processor_version="11th Gen Intel(R) Core(TM) i7-1165G7 @ 2.80GHz",
     ),
     
-    'asus_desktop': SMBIOSProfile(
+    'asus_desktop': dict(
         bios_vendor="American Megatrends Inc.",
         bios_version="3801",
         bios_date="02/22/2023",
@@ -187,6 +204,70 @@ SMBIOS_PROFILES: Dict[str, SMBIOSProfile] = {
 }
 
 
+# -smbios option keys per SMBIOS type, mapped to SMBIOSProfile fields
+SMBIOS_TYPE_FIELDS = (
+    # Type 0: BIOS Information
+    (0, (
+        ('vendor', 'bios_vendor'),
+        ('version', 'bios_version'),
+        ('date', 'bios_date'),
+    )),
+    # Type 1: System Information
+    (1, (
+        ('manufacturer', 'sys_manufacturer'),
+        ('product', 'sys_product'),
+        ('version', 'sys_version'),
+        ('serial', 'sys_serial'),
+        ('uuid', 'sys_uuid'),
+        ('sku', 'sys_sku'),
+        ('family', 'sys_family'),
+    )),
+    # Type 2: Baseboard Information
+    (2, (
+        ('manufacturer', 'board_manufacturer'),
+        ('product', 'board_product'),
+        ('version', 'board_version'),
+        ('serial', 'board_serial'),
+    )),
+    # Type 3: Chassis Information
+    (3, (
+        ('manufacturer', 'chassis_manufacturer'),
+        ('type', 'chassis_type'),
+        ('version', 'chassis_version'),
+        ('serial', 'chassis_serial'),
+    )),
+    # Type 4: Processor Information
+    (4, (
+        ('manufacturer', 'processor_manufacturer'),
+        ('version', 'processor_version'),
+    )),
+)
+
+
+@lru_cache(maxsize=None)
+def get_profile(name: str) -> SMBIOSProfile:
+    """Build a profile on first use"""
+    return SMBIOSProfile(**_RAW_PROFILES[name])
+
+
+class _LazyProfiles(Mapping):
+    """Read-only name -> SMBIOSProfile mapping that builds profiles on access"""
+    
+    def __getitem__(self, name: str) -> SMBIOSProfile:
+        if name not in _RAW_PROFILES:
+            raise KeyError(name)
+        return get_profile(name)
+    
+    def __iter__(self):
+        return iter(_RAW_PROFILES)
+    
+    def __len__(self) -> int:
+        return len(_RAW_PROFILES)
+
+
+SMBIOS_PROFILES: Mapping[str, SMBIOSProfile] = _LazyProfiles()
+
+
 class SMBIOSSpoofer:
     """
     Generates SMBIOS spoofing arguments for QEMU.
@@ -203,91 +284,79 @@ class SMBIOSSpoofer:
         if profile:
             self.profile = profile
         else:
-            self.profile = SMBIOS_PROFILES.get(profile_name, SMBIOS_PROFILES['dell_optiplex'])
+            self.profile = get_profile(profile_name if profile_name in _RAW_PROFILES else 'dell_optiplex')
         
         self._fill_auto_values()
+        
+        # The profile does not change after filling, so build args once
+        self._qemu_args = self._build_qemu_args()
     
     def _fill_auto_values(self):
         """Generate random serial numbers and UUID if not set"""
+        profile = self.profile
+        updates = {}
         
         # System serial (format varies by manufacturer)
-        if not self.profile.sys_serial:
-            if 'Dell' in self.profile.sys_manufacturer:
+        sys_serial = profile.sys_serial
+        if not sys_serial:
+            if 'Dell' in profile.sys_manufacturer:
                 # Dell format: 7 alphanumeric characters
-                self.profile.sys_serial = ''.join(random.choices(string.ascii_uppercase + string.digits, k=7))
-            elif 'HP' in self.profile.sys_manufacturer:
+                sys_serial = _randstr(7)
+            elif 'HP' in profile.sys_manufacturer:
                 # HP format: MXL + 7 alphanumeric
-                self.profile.sys_serial = 'MXL' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=7))
-            elif 'LENOVO' in self.profile.sys_manufacturer:
+                sys_serial = 'MXL' + _randstr(7)
+            elif 'LENOVO' in profile.sys_manufacturer:
                 # Lenovo format: PF + 6 alphanumeric
-                self.profile.sys_serial = 'PF' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+                sys_serial = 'PF' + _randstr(6)
             else:
-                self.profile.sys_serial = ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
+                sys_serial = _randstr(10)
+            updates['sys_serial'] = sys_serial
         
         # System UUID
-        if not self.profile.sys_uuid:
-            self.profile.sys_uuid = str(uuid.uuid4())
+        if not profile.sys_uuid:
+            updates['sys_uuid'] = _fast_uuid()
         
         # Board serial
-        if not self.profile.board_serial:
+        if not profile.board_serial:
             prefix = './'
             suffix = '/.'
-            middle = ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
-            self.profile.board_serial = f"{prefix}{middle}{suffix}"
+            middle = _randstr(10)
+            updates['board_serial'] = f"{prefix}{middle}{suffix}"
         
         # Chassis serial
-        if not self.profile.chassis_serial:
-            self.profile.chassis_serial = self.profile.sys_serial
+        if not profile.chassis_serial:
+            updates['chassis_serial'] = sys_serial
+        
+        # Profiles are frozen and shared, so fill a private copy
+        if updates:
+            self.profile = replace(profile, **updates)
     
     def get_qemu_args(self) -> List[str]:
         """Generate QEMU -smbios arguments"""
+        return list(self._qemu_args)
+    
+    def _build_qemu_args(self) -> List[str]:
+        """Build the -smbios arguments for the (already filled) profile"""
+        p = self.profile
         args = []
         
-        # Type 0: BIOS Information
-        type0 = f"type=0,vendor={self.profile.bios_vendor}"
-        type0 += f",version={self.profile.bios_version}"
-        type0 += f",date={self.profile.bios_date}"
-        args.extend(['-smbios', type0])
-        
-        # Type 1: System Information
-        type1 = f"type=1,manufacturer={self.profile.sys_manufacturer}"
-        type1 += f",product={self.profile.sys_product}"
-        type1 += f",version={self.profile.sys_version}"
-        type1 += f",serial={self.profile.sys_serial}"
-        type1 += f",uuid={self.profile.sys_uuid}"
-        type1 += f",sku={self.profile.sys_sku}"
-        type1 += f",family={self.profile.sys_family}"
-        args.extend(['-smbios', type1])
-        
-        # Type 2: Baseboard Information
-        type2 = f"type=2,manufacturer={self.profile.board_manufacturer}"
-        type2 += f",product={self.profile.board_product}"
-        type2 += f",version={self.profile.board_version}"
-        type2 += f",serial={self.profile.board_serial}"
-        args.extend(['-smbios', type2])
-        
-        # Type 3: Chassis Information
-        type3 = f"type=3,manufacturer={self.profile.chassis_manufacturer}"
-        type3 += f",type={self.profile.chassis_type}"
-        type3 += f",version={self.profile.chassis_version}"
-        type3 += f",serial={self.profile.chassis_serial}"
-        args.extend(['-smbios', type3])
-        
-        # Type 4: Processor Information
-        type4 = f"type=4,manufacturer={self.profile.processor_manufacturer}"
-        type4 += f",version={self.profile.processor_version}"
-        args.extend(['-smbios', type4])
+        for smbios_type, fields in SMBIOS_TYPE_FIELDS:
+            args.append('-smbios')
+            args.append(','.join((
+                f"type={smbios_type}",
+                *(f"{key}={getattr(p, attr)}" for key, attr in fields),
+            )))
         
         return args
     
     def get_profile_names(self) -> List[str]:
         """Get list of available profile names"""
-        return list(SMBIOS_PROFILES.keys())
+        return list(_RAW_PROFILES)
     
     @classmethod
     def random_profile(cls) -> 'SMBIOSSpoofer':
         """Create a spoofer with a random profile"""
-        profile_name = random.choice(list(SMBIOS_PROFILES.keys()))
+        profile_name = random.choice(list(_RAW_PROFILES))
         return cls(profile_name=profile_name)
 
 
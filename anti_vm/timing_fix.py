@@ -10,11 +10,12 @@ Malware uses timing-based techniques to detect virtual environments:
 This module provides QEMU configuration to stabilize timing behavior.
 """
 
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimingConfig:
     """Timing stabilization configuration"""
     
@@ -58,22 +59,7 @@ class TimingFixer:
         
         Returns list of feature flags to add to -cpu argument.
         """
-        flags = []
-        
-        # Invariant TSC - makes TSC more consistent
-        if self.config.enable_invtsc:
-            flags.append('+invtsc')
-        
-        # Set TSC frequency for consistency
-        if self.config.tsc_frequency:
-            flags.append(f'tsc-frequency={self.config.tsc_frequency}')
-        
-        # Disable KVM clock if hiding VM
-        if not self.config.kvmclock:
-            flags.append('-kvmclock')
-            flags.append('-kvmclock-stable-bit')
-        
-        return flags
+        return list(cpu_timing_flags(self.config))
     
     def get_machine_timing_flags(self) -> List[str]:
         """
@@ -81,13 +67,7 @@ class TimingFixer:
         
         Returns list to add to -machine argument.
         """
-        flags = []
-        
-        # Disable HPET
-        if self.config.disable_hpet:
-            flags.append('hpet=off')
-        
-        return flags
+        return list(machine_timing_flags(self.config))
     
     def get_rtc_args(self) -> List[str]:
         """
@@ -95,15 +75,7 @@ class TimingFixer:
         
         The RTC configuration affects time-keeping behavior.
         """
-        args = []
-        
-        # Use host clock for better accuracy
-        if self.config.clock_source == "host":
-            args.extend(['-rtc', 'base=utc,clock=host,driftfix=slew'])
-        else:
-            args.extend(['-rtc', 'base=utc,clock=vm'])
-        
-        return args
+        return list(rtc_args(self.config))
     
     def get_global_timing_args(self) -> List[str]:
         """
@@ -111,23 +83,11 @@ class TimingFixer:
         
         These affect overall timing behavior of the emulation.
         """
-        args = []
-        
-        # Disable various timing-related features that can be detected
-        # These are added as -global options
-        
-        # Disable KVMCLOCK device
-        if not self.config.kvmclock:
-            args.extend(['-global', 'kvm-pit.lost_tick_policy=delay'])
-        
-        return args
+        return list(global_timing_args(self.config))
     
     def get_all_timing_args(self) -> List[str]:
         """Get all timing-related arguments"""
-        args = []
-        args.extend(self.get_rtc_args())
-        args.extend(self.get_global_timing_args())
-        return args
+        return list(all_timing_args(self.config))
     
     def get_cpu_flags_string(self) -> str:
         """Get CPU timing flags as a comma-separated string"""
@@ -135,6 +95,61 @@ class TimingFixer:
         return ','.join(flags) if flags else ''
 
 
+# Pure-function API. Results depend only on the (frozen, hashable) config,
+# so they are memoized and shared by every caller with equal settings
+
+@lru_cache(maxsize=32)
+def _fmt_tsc_freq(hz: int) -> str:
+    """Format the tsc-frequency CPU flag"""
+    return f'tsc-frequency={hz}'
+
+
+@lru_cache(maxsize=None)
+def cpu_timing_flags(config: TimingConfig) -> Tuple[str, ...]:
+    """CPU timing feature flags for a config"""
+    return (
+        # Invariant TSC - makes TSC more consistent
+        (('+invtsc',) if config.enable_invtsc else ())
+        # Set TSC frequency for consistency
+        + ((_fmt_tsc_freq(config.tsc_frequency),) if config.tsc_frequency else ())
+        # Disable KVM clock if hiding VM
+        + (('-kvmclock', '-kvmclock-stable-bit') if not config.kvmclock else ())
+    )
+
+
+@lru_cache(maxsize=None)
+def machine_timing_flags(config: TimingConfig) -> Tuple[str, ...]:
+    """Machine timing flags for a config"""
+    # Disable HPET
+    if config.disable_hpet:
+        return ('hpet=off',)
+    return ()
+
+
+@lru_cache(maxsize=None)
+def rtc_args(config: TimingConfig) -> Tuple[str, ...]:
+    """RTC arguments for a config"""
+    # Use host clock for better accuracy
+    if config.clock_source == "host":
+        return ('-rtc', 'base=utc,clock=host,driftfix=slew')
+    return ('-rtc', 'base=utc,clock=vm')
+
+
+@lru_cache(maxsize=None)
+def global_timing_args(config: TimingConfig) -> Tuple[str, ...]:
+    """Global (-global) timing arguments for a config"""
+    # Disable KVMCLOCK device
+    if not config.kvmclock:
+        return ('-global', 'kvm-pit.lost_tick_policy=delay')
+    return ()
+
+
+@lru_cache(maxsize=None)
+def all_timing_args(config: TimingConfig) -> Tuple[str, ...]:
+    """All timing arguments for a config"""
+    return rtc_args(config) + global_timing_args(config)
+
+
 # Additional timing-based detection countermeasures for inside the guest
 
 GUEST_TIMING_SCRIPT = '''#!/bin/bash
@@ -185,6 +200,10 @@ def get_timing_args(stabilize: bool = True,
     if not stabilize:
         return []
     
+    # Fast path for the library defaults
+    if tsc_frequency == _DEFAULT_CONFIG.tsc_frequency:
+        return list(_DEFAULT_TIMING_ARGS)
+    
     config = TimingConfig(
         enable_invtsc=True,
         tsc_frequency=tsc_frequency,
@@ -192,8 +211,7 @@ def get_timing_args(stabilize: bool = True,
         kvmclock=False,
     )
     
-    fixer = TimingFixer(config)
-    return fixer.get_all_timing_args()
+    return list(all_timing_args(config))
 
 
 def get_timing_cpu_flags(stabilize: bool = True,
@@ -213,11 +231,20 @@ def get_timing_cpu_flags(stabilize: bool = True,
     if not stabilize:
         return []
     
+    # Fast path for the library defaults
+    if tsc_frequency == _DEFAULT_CONFIG.tsc_frequency:
+        return list(_DEFAULT_CPU_FLAGS)
+    
     config = TimingConfig(
         enable_invtsc=True,
         tsc_frequency=tsc_frequency,
         kvmclock=False,
     )
     
-    fixer = TimingFixer(config)
-    return fixer.get_cpu_timing_flags()
+    return list(cpu_timing_flags(config))
+
+
+# Outputs for the default configuration, computed once at import
+_DEFAULT_CONFIG = TimingConfig()
+_DEFAULT_TIMING_ARGS = all_timing_args(_DEFAULT_CONFIG)
+_DEFAULT_CPU_FLAGS = cpu_timing_flags(_DEFAULT_CONFIG)
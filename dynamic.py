@@ -12,13 +12,59 @@ import json
 import yaml
 import time
 import math
+import mmap
+import stat
 import socket
 import sqlite3
 import hashlib
+import logging
+import tempfile
+import threading
 import subprocess
 from datetime import datetime
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    _json_loads = orjson.loads
+else:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import magic
+except ImportError:
+    magic = None
+
+# Set USE_HYPERSCAN=0 to force the pure-Python regex path
+USE_HYPERSCAN = hyperscan is not None and os.environ.get('USE_HYPERSCAN', '1') != '0'
 
 # Scoring constants
 SCORE_MODULES = {
@@ -70,6 +116,38 @@ SUSPICIOUS_STRINGS = [
     (r'PTRACE_TRACEME', 'T1622', 15, 'Anti-debugging')
 ]
 
+
+def _pattern_literal(pattern: str) -> Optional[str]:
+    """Printable text matched by an escaped-literal pattern, or None for a real regex"""
+    text = re.sub(r'\\(.)', r'\1', pattern)
+    if text and text.isascii() and text.isprintable() and re.escape(text) == pattern:
+        return text
+    return None
+
+
+# Literal suspicious strings as lowercased bytes, by index into SUSPICIOUS_STRINGS
+SUSPICIOUS_LITERALS = {}
+for _i, (_pattern, _, _, _) in enumerate(SUSPICIOUS_STRINGS):
+    _text = _pattern_literal(_pattern)
+    if _text is not None:
+        SUSPICIOUS_LITERALS[_i] = _text.lower().encode('ascii')
+
+# The remaining suspicious strings as one alternation; group p<i> is SUSPICIOUS_STRINGS[i]
+_regex_patterns = [f'(?P<p{i}>{pattern})' for i, (pattern, _, _, _) in enumerate(SUSPICIOUS_STRINGS)
+                   if i not in SUSPICIOUS_LITERALS]
+SUSPICIOUS_STRINGS_RE = re.compile('|'.join(_regex_patterns), re.IGNORECASE) if _regex_patterns else None
+
+# ELF sections scanned for suspicious strings
+STRING_SECTIONS = ('.rodata', '.data', '.rdata')
+
+# Prefix of a large section whose entropy is checked before the full section
+ENTROPY_SAMPLE_SIZE = 65536
+
+# VM syscalls that produce threat events
+EXEC_SYSCALLS = frozenset({'execve', 'execveat'})
+NETWORK_SYSCALLS = frozenset({'connect', 'bind'})
+WATCHED_SYSCALLS = EXEC_SYSCALLS | NETWORK_SYSCALLS | {'ptrace'}
+
 # Suspicious network indicators
 SUSPICIOUS_TLDS = {
     '.shop', '.fun', '.xyz', '.top', '.club', '.online',
@@ -86,6 +164,9 @@ SUSPICIOUS_HOSTS = {
     'ip-api.com': ('T1016', 10, 'IP geolocation')
 }
 
+# One pass over a destination finds any of the hosts above
+SUSPICIOUS_HOSTS_RE = re.compile('|'.join(map(re.escape, SUSPICIOUS_HOSTS)))
+
 # File type detection
 FILE_TYPE_MAP = {
     '.py': 'python', '.pyw': 'python',
@@ -93,6 +174,109 @@ FILE_TYPE_MAP = {
     '.sh': 'shell', '.bash': 'shell'
 }
 
+# ELF e_machine values with a dedicated file type (others are plain 'elf')
+ELF_MACHINE_TYPES = {0x3E: 'elf_x64', 0xB7: 'elf_arm64'}
+
+# Shebang interpreters, without version suffix, recognised without file(1)
+SHEBANG_TYPES = {
+    b'python': 'python', b'node': 'javascript', b'nodejs': 'javascript',
+    b'sh': 'shell', b'bash': 'shell', b'dash': 'shell', b'ash': 'shell',
+    b'ksh': 'shell', b'csh': 'shell', b'tcsh': 'shell', b'zsh': 'shell'
+}
+
+
+class _HSMatcher:
+    """Hyperscan database reporting which of a set of regexes match a text"""
+    
+    def __init__(self, patterns: List[str], ids: List[int], caseless: bool = False):
+        flags = hyperscan.HS_FLAG_SINGLEMATCH
+        if caseless:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        self._db = hyperscan.Database()
+        self._db.compile(expressions=[p.encode() for p in patterns], ids=ids,
+                         elements=len(patterns), flags=flags)
+        self._lock = threading.Lock()
+    
+    def matches(self, text) -> Set[int]:
+        if isinstance(text, str):
+            text = text.encode('utf-8', errors='ignore')
+        found = set()
+        with self._lock:
+            self._db.scan(text,
+                          match_event_handler=lambda i, *_: found.add(i))
+        return found
+
+
+def _hs_matcher(patterns: List[str], caseless: bool = False):
+    """
+    Build a Hyperscan matcher over the patterns it can compile.
+    
+    Returns (matcher, accepted pattern indices), or (None, []) when
+    Hyperscan is unavailable or disabled.
+    """
+    if not USE_HYPERSCAN or not patterns:
+        return None, []
+    ids = list(range(len(patterns)))
+    try:
+        return _HSMatcher(patterns, ids, caseless), ids
+    except hyperscan.error:
+        pass
+    # Some pattern uses syntax Hyperscan lacks; keep the ones it accepts
+    ids = []
+    for i, p in enumerate(patterns):
+        try:
+            _HSMatcher([p], [i], caseless)
+            ids.append(i)
+        except hyperscan.error:
+            pass
+    if not ids:
+        return None, []
+    return _HSMatcher([patterns[i] for i in ids], ids, caseless), ids
+
+
+SUSPICIOUS_STRINGS_HS, _ = _hs_matcher([p for p, _, _, _ in SUSPICIOUS_STRINGS], caseless=True)
+
+
+if njit is not None:
+    # Single-pass JIT kernel over uint8 arrays; compiled code is cached on disk
+    
+    @njit(cache=True)
+    def _entropy_u8(arr):
+        counts = np.zeros(256, np.int64)
+        for b in arr:
+            counts[b] += 1
+        n = arr.size
+        entropy = 0.0
+        for c in counts:
+            if c > 0:
+                p = c / n
+                entropy -= p * np.log2(p)
+        return entropy
+else:
+    _entropy_u8 = None
+
+
+def _shannon_entropy(data: bytes) -> float:
+    """Shannon entropy of a byte string in bits per byte"""
+    n = len(data)
+    if _entropy_u8 is not None:
+        return float(_entropy_u8(np.frombuffer(data, dtype=np.uint8)))
+    if np is not None:
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        p = counts[counts > 0] / n
+        return float(-(p * np.log2(p)).sum())
+    # Counter tallies a bytes object in C
+    return -sum(c/n * math.log2(c/n) for c in Counter(data).values())
+
+
+# Runs of at least 4 printable ASCII characters
+_PRINTABLE_RUN_RE = re.compile(rb'[\x20-\x7e]{4,}')
+
+
+def _printable_strings(data) -> List[str]:
+    """Printable ASCII runs of a buffer; only needed for regex-shaped suspicious strings"""
+    return [run.decode('ascii') for run in _PRINTABLE_RUN_RE.findall(data)]
+
 
 @dataclass
 class ThreatEvent:
@@ -103,6 +287,7 @@ class ThreatEvent:
     score: int
     mitre: Optional[str] = None
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    count: int = 1  # Repeats folded into this event by ThreatScorer
 
 
 @dataclass
@@ -129,6 +314,16 @@ class AnalysisResult:
     mitre_techniques: List[str] = field(default_factory=list)
 
 
+def _is_private_dir(path: str) -> bool:
+    """True for a real directory owned by the current user with no group or other access"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid()
+            and not st.st_mode & (stat.S_IRWXG | stat.S_IRWXO))
+
+
 class YaraScanner:
     """YARA-based signature scanner"""
     
@@ -139,17 +334,50 @@ class YaraScanner:
         try:
             import yara
             if os.path.exists(rules_dir):
+                names = sorted(os.listdir(rules_dir))
                 rule_files = {
                     f: os.path.join(rules_dir, f)
-                    for f in os.listdir(rules_dir)
+                    for f in names
                     if f.endswith(('.yar', '.yara'))
                 }
+                precompiled = [f for f in names if f.endswith('.yarc')]
                 if rule_files:
-                    self.rules = yara.compile(filepaths=rule_files)
+                    self.rules = self._load_cached(yara, rule_files)
+                elif precompiled:
+                    # yarac output from the configured rules directory; used as-is when there are no sources
+                    self.rules = yara.load(os.path.join(rules_dir, precompiled[0]))
             self._available = self.rules is not None
         except ImportError:
             pass
     
+    @staticmethod
+    def _load_cached(yara, rule_files: Dict[str, str]):
+        """Compile rule files, reusing a compiled copy keyed by their name, mtime and size"""
+        key = hashlib.sha256(yara.__version__.encode())
+        for name, path in sorted(rule_files.items()):
+            st = os.stat(path)
+            key.update(f"\0{name}\0{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}".encode())
+        cache_dir = os.path.join(tempfile.gettempdir(), f"yara_cache_{os.getuid()}")
+        cache_path = os.path.join(cache_dir, f"yara_{key.hexdigest()}.compiled")
+        if _is_private_dir(cache_dir) and os.path.exists(cache_path):
+            try:
+                return yara.load(cache_path)
+            except yara.Error:
+                pass
+        rules = yara.compile(filepaths=rule_files)
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            if not _is_private_dir(cache_dir):
+                # Someone else controls the path; never write (or later load) rules there
+                return rules
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            os.close(fd)
+            rules.save(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except (OSError, yara.Error):
+            pass
+        return rules
+    
     @property
     def available(self) -> bool:
         return self._available
@@ -178,8 +406,10 @@ class ELFAnalyzer:
     
     def __init__(self):
         self._available = False
+        self._elf_file = None
         try:
             from elftools.elf.elffile import ELFFile
+            self._elf_file = ELFFile
             self._available = True
         except ImportError:
             pass
@@ -193,67 +423,107 @@ class ELFAnalyzer:
             return []
         events = []
         try:
-            from elftools.elf.elffile import ELFFile
             with open(file_path, 'rb') as f:
-                elf = ELFFile(f)
-                events.extend(self._analyze_imports(elf))
-                f.seek(0)
-                events.extend(self._analyze_strings(f.read()))
-                events.extend(self._analyze_entropy(elf))
-        except Exception:
-            pass
+                if f.read(4) != b'\x7fELF':
+                    return []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    buf = memoryview(mm)
+                    try:
+                        elf = self._elf_file(f)
+                        events.extend(self._analyze_imports(elf))
+                        events.extend(self._analyze_strings(elf, buf))
+                        events.extend(self._analyze_entropy(elf, buf))
+                    finally:
+                        buf.release()
+        except Exception as e:
+            logger.warning("ELF analysis of %s failed: %s", file_path, e)
         return events
     
     def _analyze_imports(self, elf) -> List[ThreatEvent]:
         events, found = [], set()
         try:
-            for section in elf.iter_sections():
-                if section.name == '.dynstr':
-                    for s in section.data().split(b'\x00'):
-                        sym = s.decode('utf-8', errors='ignore')
-                        if sym in SUSPICIOUS_IMPORTS and sym not in found:
-                            found.add(sym)
-                            mitre, score, desc = SUSPICIOUS_IMPORTS[sym]
-                            events.append(ThreatEvent(
-                                source='elf', event_type='import',
-                                details=f"{sym}: {desc}", score=score, mitre=mitre
-                            ))
+            section = elf.get_section_by_name('.dynstr')
+            if section is not None:
+                for s in section.data().split(b'\x00'):
+                    sym = s.decode('utf-8', errors='ignore')
+                    if sym in SUSPICIOUS_IMPORTS and sym not in found:
+                        found.add(sym)
+                        mitre, score, desc = SUSPICIOUS_IMPORTS[sym]
+                        events.append(ThreatEvent(
+                            source='elf', event_type='import',
+                            details=f"{sym}: {desc}", score=score, mitre=mitre
+                        ))
         except Exception:
             pass
         return events
     
-    def _analyze_strings(self, data: bytes) -> List[ThreatEvent]:
-        events, strings, current = [], [], []
-        for b in data:
-            if 32 <= b <= 126:
-                current.append(chr(b))
-            else:
-                if len(current) >= 4:
-                    strings.append(''.join(current))
-                current = []
-        all_strings = '\n'.join(strings)
-        for pattern, mitre, score, desc in SUSPICIOUS_STRINGS:
-            if re.search(pattern, all_strings, re.IGNORECASE):
-                events.append(ThreatEvent(
-                    source='elf', event_type='string',
-                    details=desc, score=score, mitre=mitre
-                ))
+    @staticmethod
+    def _section_data(section, buf: memoryview):
+        """Section contents as a view into the mapped file where they are stored as is"""
+        if section.compressed or section['sh_type'] == 'SHT_NOBITS':
+            return section.data()
+        offset = section['sh_offset']
+        return buf[offset:offset + section['sh_size']]
+    
+    def _string_data(self, elf, buf: memoryview) -> List[memoryview]:
+        """Contents of the sections that hold string constants"""
+        chunks = []
+        for name in STRING_SECTIONS:
+            section = elf.get_section_by_name(name)
+            if section is not None and section['sh_type'] != 'SHT_NOBITS':
+                chunks.append(self._section_data(section, buf))
+        if not chunks:
+            # No usable section headers (stripped or packed): scan the whole file
+            chunks.append(buf)
+        return chunks
+    
+    def _analyze_strings(self, elf, buf: memoryview) -> List[ThreatEvent]:
+        events = []
+        chunks = self._string_data(elf, buf)
+        found = None
+        if SUSPICIOUS_STRINGS_HS is not None:
+            # Patterns only match printable text, so raw section views need no extraction;
+            # hyperscan's scan takes any contiguous buffer, memoryview slices included
+            try:
+                found = set()
+                for data in chunks:
+                    found |= SUSPICIOUS_STRINGS_HS.matches(data)
+            except Exception as e:
+                logger.warning("hyperscan string scan failed, using the Python matcher: %s", e)
+                found = None
+        if found is None:
+            # Literals are printable, so a substring test on the raw bytes finds the same
+            # hits; NUL never occurs in a literal, so joining cannot create false ones.
+            # This is the one copy of the section data, lowercased once per file.
+            lowered = b'\x00'.join(chunks).lower()
+            found = {i for i, lit in SUSPICIOUS_LITERALS.items() if lit in lowered}
+            # Regex-shaped entries (none in the current table) match on printable runs
+            if SUSPICIOUS_STRINGS_RE is not None:
+                all_strings = '\n'.join(s for data in chunks for s in _printable_strings(data))
+                for m in SUSPICIOUS_STRINGS_RE.finditer(all_strings):
+                    found.add(int(m.lastgroup[1:]))
+                    if len(found) == len(SUSPICIOUS_STRINGS):
+                        break
+        for i in sorted(found):
+            _, mitre, score, desc = SUSPICIOUS_STRINGS[i]
+            events.append(ThreatEvent(
+                source='elf', event_type='string',
+                details=desc, score=score, mitre=mitre
+            ))
         return events
     
-    def _analyze_entropy(self, elf) -> List[ThreatEvent]:
+    def _analyze_entropy(self, elf, buf: memoryview) -> List[ThreatEvent]:
         events = []
         for section in elf.iter_sections():
             if section.name in ['.text', '.data']:
                 try:
-                    data = section.data()
+                    data = self._section_data(section, buf)
                     if len(data) > 100:
-                        counts = [0] * 256
-                        for b in data:
-                            counts[b] += 1
-                        entropy = -sum(
-                            c/len(data) * math.log2(c/len(data))
-                            for c in counts if c > 0
-                        )
+                        # A clearly structured prefix rules out packed data
+                        if (len(data) > ENTROPY_SAMPLE_SIZE and
+                                _shannon_entropy(data[:ENTROPY_SAMPLE_SIZE]) < 7.0):
+                            continue
+                        entropy = _shannon_entropy(data)
                         if entropy > 7.5:
                             events.append(ThreatEvent(
                                 source='elf', event_type='entropy',
@@ -270,29 +540,63 @@ class RuleEngine:
     
     def __init__(self, patterns_file: str = "patterns.yaml"):
         self.patterns: Dict = {}
+        # Per language: (category, pattern entry, compiled regex, hyperscan id or None)
+        self._scripts: Dict[str, List[Tuple[str, Dict, re.Pattern, Optional[int]]]] = {}
+        self._hs: Dict = {}
         if os.path.exists(patterns_file):
             try:
                 with open(patterns_file, 'r', encoding='utf-8') as f:
                     self.patterns = yaml.safe_load(f) or {}
             except Exception:
                 pass
+        self._compile_script_patterns()
+    
+    def _compile_script_patterns(self):
+        """
+        Compile script regexes once into self._scripts, leaving the loaded
+        patterns untouched; entries that fail to compile are skipped.
+        
+        With Hyperscan, each language also gets one database, and entries it
+        covers carry their id in it.
+        """
+        scripts = self.patterns.get('scripts') if isinstance(self.patterns, dict) else None
+        for language, categories in (scripts.items() if isinstance(scripts, dict) else ()):
+            if not isinstance(categories, dict):
+                continue
+            entries = []
+            for category, patterns in categories.items():
+                if isinstance(patterns, list):
+                    for p in patterns:
+                        if isinstance(p, dict) and p.get('pattern'):
+                            try:
+                                entries.append((category, p, re.compile(p['pattern'])))
+                            except Exception:
+                                pass
+            matcher, ids = _hs_matcher([p['pattern'] for _, p, _ in entries])
+            if matcher is not None:
+                self._hs[language] = matcher
+            hs_ids = set(ids)
+            self._scripts[language] = [
+                (category, p, regex, i if i in hs_ids else None)
+                for i, (category, p, regex) in enumerate(entries)
+            ]
     
     def match_script(self, language: str, code: str) -> List[ThreatEvent]:
         events = []
-        for category, patterns in self.patterns.get('scripts', {}).get(language, {}).items():
-            if isinstance(patterns, list):
-                for p in patterns:
-                    if isinstance(p, dict) and p.get('pattern'):
-                        try:
-                            if re.search(p['pattern'], code):
-                                events.append(ThreatEvent(
-                                    source='script', event_type=category,
-                                    details=p.get('description', 'Suspicious pattern'),
-                                    score=p.get('score', 10),
-                                    mitre=p.get('mitre')
-                                ))
-                        except Exception:
-                            pass
+        hs = self._hs.get(language)
+        hits = hs.matches(code) if hs is not None else ()
+        for category, p, regex, hs_id in self._scripts.get(language, ()):
+            if hs_id is not None:
+                matched = hs_id in hits
+            else:
+                matched = regex.search(code)
+            if matched:
+                events.append(ThreatEvent(
+                    source='script', event_type=category,
+                    details=p.get('description', 'Suspicious pattern'),
+                    score=p.get('score', 10),
+                    mitre=p.get('mitre')
+                ))
         return events
     
     def get_threshold(self, level: str) -> int:
@@ -305,9 +609,19 @@ class ThreatScorer:
     def __init__(self, rule_engine: Optional[RuleEngine] = None):
         self.events: List[ThreatEvent] = []
         self.total_score = 0
-        self.rule_engine = rule_engine or RuleEngine()
+        self._seen: Dict[tuple, ThreatEvent] = {}
+        self.rule_engine = rule_engine or get_rule_engine()
+        self._clean = self.rule_engine.get_threshold('clean')
+        self._suspicious = self.rule_engine.get_threshold('suspicious')
     
     def add_event(self, event: ThreatEvent):
+        # Repeated indicators (e.g. a syscall in a loop) count once
+        key = (event.source, event.event_type, event.mitre, event.details[:64])
+        seen = self._seen.get(key)
+        if seen is not None:
+            seen.count += 1
+            return
+        self._seen[key] = event
         self.events.append(event)
         self.total_score += event.score
     
@@ -324,17 +638,17 @@ class ThreatScorer:
             ))
     
     def get_verdict(self) -> str:
-        clean = self.rule_engine.get_threshold('clean')
-        suspicious = self.rule_engine.get_threshold('suspicious')
-        if self.total_score <= clean:
+        if self.total_score <= self._clean:
             return "CLEAN"
-        if self.total_score <= suspicious:
+        if self.total_score <= self._suspicious:
             return "SUSPICIOUS"
         return "MALICIOUS"
     
     def get_reasons(self) -> List[str]:
         return [
-            f"[{e.source.upper()}] {e.details}" + (f" ({e.mitre})" if e.mitre else "")
+            f"[{e.source.upper()}] {e.details}"
+            + (f" x{e.count}" if e.count > 1 else "")
+            + (f" ({e.mitre})" if e.mitre else "")
             for e in self.events
         ]
     
@@ -342,13 +656,25 @@ class ThreatScorer:
         return list({e.mitre for e in self.events if e.mitre})
 
 
+# Latest results kept in memory per AnalysisDB, by file hash
+_RESULT_CACHE_SIZE = 4096
+
+
 class AnalysisDB:
     """SQLite database for caching analysis results"""
     
     def __init__(self, db_path: str = "logs/dynamic_analysis.db"):
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        with sqlite3.connect(db_path) as conn:
+        # One autocommit connection per database, shared across threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._recent: OrderedDict = OrderedDict()
+        with self._lock:
+            conn = self._conn
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS analyses (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -364,34 +690,144 @@ class AnalysisDB:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analyses_hash ON analyses(file_hash, created_at)"
+            )
     
     def save(self, path: str, result: AnalysisResult) -> int:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute(
+        with self._lock:
+            cur = self._conn.execute(
                 """INSERT INTO analyses 
                    (file_hash, file_name, file_type, verdict, threat_score, 
                     duration, reasons, yara_matches, mitre_techniques) 
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (result.file_hash, os.path.basename(path), result.file_type,
                  result.verdict, result.threat_score, result.duration,
-                 json.dumps(result.reasons), json.dumps(result.yara_matches),
-                 json.dumps(result.mitre_techniques))
+                 _json_dumps(result.reasons), _json_dumps(result.yara_matches),
+                 _json_dumps(result.mitre_techniques))
             )
+            self._recent.pop(result.file_hash, None)
             return cur.lastrowid
     
     def get_by_hash(self, file_hash: str) -> Optional[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
+        with self._lock:
+            cached = self._recent.get(file_hash)
+            if cached is not None:
+                self._recent.move_to_end(file_hash)
+                return dict(cached)
+            row = self._conn.execute(
                 "SELECT * FROM analyses WHERE file_hash=? ORDER BY created_at DESC LIMIT 1",
                 (file_hash,)
             ).fetchone()
-        if row:
-            return {
-                k: json.loads(row[k]) if k in ('reasons', 'yara_matches', 'mitre_techniques') and row[k] else row[k]
+            if not row:
+                return None
+            cached = {
+                k: _json_loads(row[k]) if k in ('reasons', 'yara_matches', 'mitre_techniques') and row[k] else row[k]
                 for k in row.keys()
             }
-        return None
+            self._recent[file_hash] = cached
+            if len(self._recent) > _RESULT_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return dict(cached)
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Leading bytes kept per file: enough for the ELF header and a shebang line
+_HEAD_SIZE = 128
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(path: str, mtime_ns: int, size: int) -> Tuple[str, bytes]:
+    """sha256 hex digest and leading bytes of a file; stat fields key the cache"""
+    with open(path, 'rb') as f:
+        head = f.read(_HEAD_SIZE)
+        f.seek(0)
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest(), head
+        # Python < 3.11: hash a read-only mapping, or read in 1 MiB chunks
+        h = hashlib.sha256()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        except (OSError, ValueError):
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest(), head
+
+
+def _sniff_type(head: bytes) -> Optional[str]:
+    """Classify ELF binaries and shebang scripts from their leading bytes"""
+    if head.startswith(b'\x7fELF') and len(head) >= 20:
+        machine = int.from_bytes(head[18:20], 'big' if head[5] == 2 else 'little')
+        return ELF_MACHINE_TYPES.get(machine, 'elf')
+    if head.startswith(b'#!'):
+        argv = head[2:].split(b'\n', 1)[0].split()
+        if argv and argv[0].endswith(b'/env'):
+            argv = [a for a in argv[1:] if not a.startswith(b'-')]
+        if argv:
+            return SHEBANG_TYPES.get(argv[0].rsplit(b'/', 1)[-1].rstrip(b'0123456789.'))
+    return None
+
+
+def _stat_key(path: str) -> tuple:
+    """Change marker for a file, or for the files directly inside a directory"""
+    try:
+        if os.path.isdir(path):
+            return tuple(
+                (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+                for e in sorted(os.scandir(path), key=lambda e: e.name)
+            )
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return ()
+
+
+@lru_cache(maxsize=1024)
+def _describe_file(path: str, mtime_ns: int, size: int) -> str:
+    """Lowercased file(1) description; stat fields key the cache"""
+    if magic is not None:
+        try:
+            return magic.from_file(path).lower()
+        except Exception:
+            pass
+    return subprocess.run(
+        ['file', '-b', path],
+        capture_output=True, text=True, timeout=5
+    ).stdout.lower()
+
+
+# Scanners are shared per process; keying on the stat marker picks up
+# edited rules or patterns without recompiling on every analyzer
+
+@lru_cache(maxsize=8)
+def _cached_yara(rules_dir: str, key: tuple) -> YaraScanner:
+    return YaraScanner(rules_dir)
+
+
+@lru_cache(maxsize=8)
+def _cached_rules(patterns_file: str, key: tuple) -> RuleEngine:
+    return RuleEngine(patterns_file)
+
+
+def get_yara_scanner(rules_dir: str = "yara_rules") -> YaraScanner:
+    """Shared YaraScanner for a rules directory"""
+    return _cached_yara(rules_dir, _stat_key(rules_dir))
+
+
+def get_rule_engine(patterns_file: str = "patterns.yaml") -> RuleEngine:
+    """Shared RuleEngine for a patterns file"""
+    return _cached_rules(patterns_file, _stat_key(patterns_file))
+
+
+@lru_cache(maxsize=None)
+def get_elf_analyzer() -> ELFAnalyzer:
+    """Shared ELFAnalyzer"""
+    return ELFAnalyzer()
 
 
 class DynamicAnalyzer:
@@ -406,12 +842,13 @@ class DynamicAnalyzer:
                  yara_dir: str = "yara_rules", patterns_file: str = "patterns.yaml",
                  vm_config_path: str = "vm_config.yaml"):
         self.timeout = timeout
-        self.yara = YaraScanner(yara_dir)
-        self.rules = RuleEngine(patterns_file)
-        self.elf = ELFAnalyzer()
+        self.yara = get_yara_scanner(yara_dir)
+        self.rules = get_rule_engine(patterns_file)
+        self.elf = get_elf_analyzer()
         self.db = AnalysisDB(db_path)
         self.vm_config_path = vm_config_path
         self._vm_manager = None
+        self._vm_arch = None
         self._vm_available = False
         self._init_vm_manager()
     
@@ -419,6 +856,8 @@ class DynamicAnalyzer:
         """Initialize VM manager if available"""
         try:
             from vm_manager.vm_manager import VMManager
+            from vm_manager.vm_config import VMArchitecture
+            self._vm_arch = VMArchitecture
             if os.path.exists(self.vm_config_path):
                 self._vm_manager = VMManager(config_path=self.vm_config_path)
                 self._vm_available = True
@@ -431,25 +870,36 @@ class DynamicAnalyzer:
     def vm_available(self) -> bool:
         return self._vm_available and self._vm_manager is not None
     
-    def _hash_file(self, path: str) -> str:
-        h = hashlib.sha256()
+    def _file_info(self, path: str) -> Tuple[str, bytes]:
+        """sha256 and leading bytes of a file, cached on its mtime and size"""
         try:
-            with open(path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    h.update(chunk)
-            return h.hexdigest()
+            st = os.stat(path)
+            return _file_digest(path, st.st_mtime_ns, st.st_size)
         except Exception:
-            return ''
+            return '', b''
     
-    def _detect_type(self, path: str) -> str:
+    def _hash_file(self, path: str) -> str:
+        return self._file_info(path)[0]
+    
+    def _detect_type(self, path: str, head: Optional[bytes] = None) -> str:
         ext = os.path.splitext(path)[1].lower()
         if ext in FILE_TYPE_MAP:
             return FILE_TYPE_MAP[ext]
+        if head is None:
+            try:
+                with open(path, 'rb') as f:
+                    head = f.read(_HEAD_SIZE)
+            except OSError:
+                head = b''
+        sniffed = _sniff_type(head)
+        if sniffed:
+            return sniffed
+        try:
+            st = os.stat(path)
+        except OSError:
+            return 'unknown'
         try:
-            info = subprocess.run(
-                ['file', '-b', path],
-                capture_output=True, text=True, timeout=5
-            ).stdout.lower()
+            info = _describe_file(path, st.st_mtime_ns, st.st_size)
             if 'elf' in info:
                 if 'x86-64' in info or 'amd64' in info:
                     return 'elf_x64'
@@ -482,7 +932,7 @@ class DynamicAnalyzer:
         if not os.path.exists(file_path):
             return {'verdict': 'ERROR', 'threat_score': 0, 'reasons': ['File not found']}
         
-        file_hash = self._hash_file(file_path)
+        file_hash, head = self._file_info(file_path)
         
         # Check cache
         if use_cache and file_hash:
@@ -492,36 +942,27 @@ class DynamicAnalyzer:
                 return cached
         
         scorer = ThreatScorer(self.rules)
-        file_type = self._detect_type(file_path)
-        
-        # Static analysis (YARA)
-        scorer.add_yara_matches(self.yara.scan(file_path))
-        
-        # Script pattern matching
-        if file_type in ['python', 'javascript', 'shell']:
-            try:
-                with open(file_path, 'r', errors='ignore') as f:
-                    scorer.add_events(self.rules.match_script(file_type, f.read()))
-            except Exception:
-                pass
+        file_type = self._detect_type(file_path, head)
         
-        # ELF analysis
-        elif file_type.startswith('elf'):
-            scorer.add_events(self.elf.analyze(file_path))
+        # YARA, static analysis and the VM run are independent; run them
+        # side by side and score the results in order afterwards
+        vm_used = self.vm_available
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            yara_future = pool.submit(self.yara.scan, file_path)
+            static_future = pool.submit(self._static_by_type, file_path, file_type)
+            vm_future = (pool.submit(self._run_in_vm, file_path, file_type, architecture)
+                         if vm_used else None)
+            yara_matches = yara_future.result()
+            static_events = static_future.result()
+            sandbox_result = (vm_future.result() if vm_future is not None
+                              else {'error': 'VM not available', 'success': False})
         
-        # Dynamic analysis in VM
-        sandbox_result = {}
-        vm_used = False
+        scorer.add_yara_matches(yara_matches)
+        scorer.add_events(static_events)
         
-        if self.vm_available:
-            sandbox_result = self._run_in_vm(file_path, file_type, architecture)
-            vm_used = True
-            
-            # Process VM events
-            if sandbox_result.get('success'):
-                self._process_vm_events(scorer, sandbox_result)
-        else:
-            sandbox_result = {'error': 'VM not available', 'success': False}
+        # Process VM events
+        if sandbox_result.get('success'):
+            self._process_vm_events(scorer, sandbox_result)
         
         duration = time.time() - start
         
@@ -533,7 +974,7 @@ class DynamicAnalyzer:
             duration=duration,
             file_type=file_type,
             file_hash=file_hash,
-            yara_matches=[m.rule for m in self.yara.scan(file_path)],
+            yara_matches=[m.rule for m in yara_matches],
             mitre_techniques=scorer.get_mitre_techniques()
         )
         
@@ -557,25 +998,42 @@ class DynamicAnalyzer:
             'vm_used': vm_used,
         }
     
+    def _static_by_type(self, file_path: str, file_type: str) -> List[ThreatEvent]:
+        """Script pattern matching or ELF analysis, depending on file type"""
+        if file_type in ['python', 'javascript', 'shell']:
+            try:
+                with open(file_path, 'r', errors='ignore') as f:
+                    return self.rules.match_script(file_type, f.read())
+            except Exception:
+                return []
+        if file_type.startswith('elf'):
+            return self.elf.analyze(file_path)
+        return []
+    
     def _process_vm_events(self, scorer: ThreatScorer, sandbox_result: Dict):
         """Process events from VM analysis"""
-        # Syscall events
+        add = scorer.add_event
+        
+        # Syscall events; most are uninteresting and skipped on one set lookup
         for event in sandbox_result.get('syscalls', []):
-            syscall = event.get('syscall', '')
-            if syscall in ['execve', 'execveat']:
-                scorer.add_event(ThreatEvent(
+            get = event.get
+            syscall = get('syscall', '')
+            if syscall not in WATCHED_SYSCALLS:
+                continue
+            if syscall in EXEC_SYSCALLS:
+                add(ThreatEvent(
                     source='vm', event_type='syscall',
-                    details=f"exec: {event.get('args', [''])[0][:100]}",
+                    details=f"exec: {get('args', [''])[0][:100]}",
                     score=10, mitre='T1059'
                 ))
-            elif syscall in ['connect', 'bind']:
-                scorer.add_event(ThreatEvent(
+            elif syscall in NETWORK_SYSCALLS:
+                add(ThreatEvent(
                     source='vm', event_type='syscall',
                     details=f"network: {syscall}",
                     score=10, mitre='T1071'
                 ))
-            elif syscall == 'ptrace':
-                scorer.add_event(ThreatEvent(
+            else:
+                add(ThreatEvent(
                     source='vm', event_type='syscall',
                     details='ptrace call detected',
                     score=20, mitre='T1055.008'
@@ -583,20 +1041,21 @@ class DynamicAnalyzer:
         
         # Network events
         for event in sandbox_result.get('network', []):
-            dst = event.get('dst_addr', '')
-            port = event.get('dst_port', 0)
+            get = event.get
+            dst = get('dst_addr', '')
+            port = get('dst_port', 0)
             
             # Check for suspicious hosts
-            for host, (mitre, score, desc) in SUSPICIOUS_HOSTS.items():
-                if host in dst:
-                    scorer.add_event(ThreatEvent(
-                        source='vm', event_type='network',
-                        details=f"{desc}: {dst}:{port}",
-                        score=score, mitre=mitre
-                    ))
-                    break
+            hit = SUSPICIOUS_HOSTS_RE.search(dst)
+            if hit:
+                mitre, score, desc = SUSPICIOUS_HOSTS[hit.group()]
+                add(ThreatEvent(
+                    source='vm', event_type='network',
+                    details=f"{desc}: {dst}:{port}",
+                    score=score, mitre=mitre
+                ))
             else:
-                scorer.add_event(ThreatEvent(
+                add(ThreatEvent(
                     source='vm', event_type='network',
                     details=f"connection to {dst}:{port}",
                     score=5, mitre='T1071'
@@ -605,17 +1064,16 @@ class DynamicAnalyzer:
         # File events
         for event in sandbox_result.get('files', []):
             path = event.get('path', '')
-            event_type = event.get('event_type', '')
             
             # Check for sensitive file access
             if '/etc/shadow' in path or '/etc/passwd' in path:
-                scorer.add_event(ThreatEvent(
+                add(ThreatEvent(
                     source='vm', event_type='file',
                     details=f"sensitive file access: {path}",
                     score=20, mitre='T1003'
                 ))
             elif '/.ssh/' in path:
-                scorer.add_event(ThreatEvent(
+                add(ThreatEvent(
                     source='vm', event_type='file',
                     details=f"SSH directory access: {path}",
                     score=15, mitre='T1552.004'
@@ -628,7 +1086,7 @@ class DynamicAnalyzer:
             return {'error': 'VM manager not available', 'success': False}
         
         try:
-            from vm_manager.vm_config import VMArchitecture
+            VMArchitecture = self._vm_arch
             
             # Determine architecture
             if architecture:
@@ -670,7 +1128,7 @@ class DynamicAnalyzer:
             return False
         
         try:
-            from vm_manager.vm_config import VMArchitecture
+            VMArchitecture = self._vm_arch
             arch = VMArchitecture.ARM64 if 'arm' in architecture.lower() else VMArchitecture.X64
             return self._vm_manager.start_vm(arch)
         except Exception as e:
@@ -684,7 +1142,7 @@ class DynamicAnalyzer:
         
         if architecture:
             try:
-                from vm_manager.vm_config import VMArchitecture
+                VMArchitecture = self._vm_arch
                 arch = VMArchitecture.ARM64 if 'arm' in architecture.lower() else VMArchitecture.X64
                 self._vm_manager.stop_vm(arch)
             except Exception:
@@ -717,6 +1175,7 @@ class DynamicAnalyzer:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._vm_manager:
             self._vm_manager.stop_all()
+        self.db.close()
 
 
 # Backward compatibility alias
@@ -21,6 +21,12 @@ SUSPICIOUS_IMPORTS = {
                    'vm', 'cluster', 'dns', 'tls', 'puppeteer', 'selenium-webdriver']
 }
 
+# Word-boundary regex per suspicious import, compiled once
+SUSPICIOUS_IMPORT_RES = {
+    lang: [(imp, re.compile(rf'\b{re.escape(imp)}\b')) for imp in imports]
+    for lang, imports in SUSPICIOUS_IMPORTS.items()
+}
+
 EXT_LANG = {'.py': 'python', '.pyw': 'python', '.js': 'javascript', '.mjs': 'javascript'}
 
 
@@ -88,7 +94,7 @@ class ImportAnalyzer:
         try:
             with open(path, 'r', errors='ignore') as f:
                 code = f.read()
-            return [imp for imp in SUSPICIOUS_IMPORTS.get(lang, []) if re.search(rf'\b{re.escape(imp)}\b', code)]
+            return [imp for imp, pattern in SUSPICIOUS_IMPORT_RES.get(lang, []) if pattern.search(code)]
         except:
             return []
 
@@ -111,10 +117,12 @@ class StaticAnalyzer:
         self.thresholds = cfg.get('verdict', {'clean': 15, 'suspicious': 30})
 
     def _hash(self, path: str) -> str:
-        h = hashlib.sha256()
         try:
             with open(path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
+                if hasattr(hashlib, 'file_digest'):
+                    return hashlib.file_digest(f, 'sha256').hexdigest()
+                h = hashlib.sha256()
+                for chunk in iter(lambda: f.read(1 << 20), b''):
                     h.update(chunk)
             return h.hexdigest()
         except:
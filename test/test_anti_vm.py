@@ -144,6 +144,20 @@ class TestSMBIOSSpoofer(unittest.TestCase):
         uuid = spoofer.profile.sys_uuid
         self.assertTrue('-' in uuid)
         self.assertEqual(len(uuid), 36)
+    
+    def test_auto_values_do_not_touch_shared_profile(self):
+        """Test that generated values go to a private copy of the profile"""
+        from anti_vm.smbios_spoof import SMBIOSSpoofer, get_profile
+        
+        first = SMBIOSSpoofer(profile_name='hp_prodesk')
+        second = SMBIOSSpoofer(profile_name='hp_prodesk')
+        shared = get_profile('hp_prodesk')
+        
+        self.assertFalse(shared.sys_serial)
+        self.assertFalse(shared.sys_uuid)
+        self.assertTrue(first.profile.sys_serial.startswith('MXL'))
+        self.assertEqual(first.profile.chassis_serial, first.profile.sys_serial)
+        self.assertNotEqual(first.profile.sys_uuid, second.profile.sys_uuid)
 
 
 class TestHardwareSpoofer(unittest.TestCase):
@@ -186,6 +200,39 @@ class TestHardwareSpoofer(unittest.TestCase):
         
         self.assertTrue(serial.startswith('WD-WCAV'))
         self.assertTrue(len(serial) > 10)
+    
+    def test_batch_mac_generation(self):
+        """Test batch MAC generation uses the vendor OUIs"""
+        from anti_vm.hardware_spoof import HardwareSpoofer, HardwareConfig, MAC_OUI_PREFIXES
+        
+        spoofer = HardwareSpoofer(HardwareConfig(mac_vendor='hp'))
+        macs = spoofer.generate_macs(50)
+        
+        self.assertEqual(len(macs), 50)
+        for mac in macs:
+            self.assertRegex(mac, r'^([0-9A-F]{2}:){5}[0-9A-F]{2}$')
+            self.assertIn(mac[:8], MAC_OUI_PREFIXES['hp'])
+    
+    def test_batch_mac_custom(self):
+        """Test batch MAC generation honours a custom MAC"""
+        from anti_vm.hardware_spoof import HardwareSpoofer, HardwareConfig
+        
+        spoofer = HardwareSpoofer(HardwareConfig(custom_mac='D4:BE:D9:01:02:03'))
+        self.assertEqual(spoofer.generate_macs(3), ['D4:BE:D9:01:02:03'] * 3)
+    
+    def test_batch_serial_generation(self):
+        """Test batch disk serial generation"""
+        from anti_vm.hardware_spoof import HardwareSpoofer, HardwareConfig
+        
+        spoofer = HardwareSpoofer(HardwareConfig(disk_vendor='seagate'))
+        serials = spoofer.generate_serials(20)
+        
+        self.assertEqual(len(serials), 20)
+        for serial in serials:
+            self.assertRegex(serial, r'^ST[0-9]{8}[A-Z]{3}$')
+        
+        custom = HardwareSpoofer(HardwareConfig(custom_disk_serial='WD-TEST'))
+        self.assertEqual(custom.generate_serials(2), ['WD-TEST', 'WD-TEST'])
 
 
 class TestSensorsFaker(unittest.TestCase):
@@ -307,6 +354,14 @@ class TestVMManager(unittest.TestCase):
 class TestVMDynamicAnalyzer(unittest.TestCase):
     """Test VM Dynamic Analyzer integration"""
     
+    def setUp(self):
+        # Keep the analysis database out of the working tree
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'dynamic_analysis.db')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
     def test_import(self):
         """Test VMDynamicAnalyzer import"""
         from dynamic import VMDynamicAnalyzer
@@ -316,15 +371,16 @@ class TestVMDynamicAnalyzer(unittest.TestCase):
         """Test initialization without VM config"""
         from dynamic import VMDynamicAnalyzer
         
-        analyzer = VMDynamicAnalyzer(vm_config_path="/nonexistent/path.yaml")
-        self.assertFalse(analyzer.vm_available)
+        with VMDynamicAnalyzer(db_path=self.db_path,
+                               vm_config_path="/nonexistent/path.yaml") as analyzer:
+            self.assertFalse(analyzer.vm_available)
     
     def test_get_status(self):
         """Test status retrieval"""
         from dynamic import VMDynamicAnalyzer
         
-        analyzer = VMDynamicAnalyzer()
-        status = analyzer.get_status()
+        with VMDynamicAnalyzer(db_path=self.db_path) as analyzer:
+            status = analyzer.get_status()
         
         self.assertIn('yara_available', status)
         self.assertIn('vm_available', status)
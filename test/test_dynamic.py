@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Dynamic Analyzer Tests
+
+Tests for the scoring, caching and file-type helpers of the
+dynamic analysis module that do not need a running VM.
+"""
+
+import os
+import sys
+import stat
+import unittest
+import tempfile
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import yara
+except ImportError:
+    yara = None
+
+
+def _event(details='exec: /bin/sh', score=10, source='vm', mitre='T1059'):
+    from dynamic import ThreatEvent
+    return ThreatEvent(source=source, event_type='process', details=details,
+                       score=score, mitre=mitre)
+
+
+def _result(file_hash, verdict='CLEAN', score=0):
+    from dynamic import AnalysisResult
+    return AnalysisResult(
+        verdict=verdict, threat_score=score, reasons=[f"score {score}"],
+        events=[], duration=0.1, file_type='elf_x64', file_hash=file_hash
+    )
+
+
+class TestThreatScorer(unittest.TestCase):
+    """Test event aggregation and scoring"""
+    
+    def test_repeated_events_count_once(self):
+        """Test that a repeated indicator is scored once and counted"""
+        from dynamic import ThreatScorer
+        
+        scorer = ThreatScorer()
+        for _ in range(3):
+            scorer.add_event(_event())
+        
+        self.assertEqual(len(scorer.events), 1)
+        self.assertEqual(scorer.events[0].count, 3)
+        self.assertEqual(scorer.total_score, 10)
+        self.assertEqual(scorer.get_reasons(), ['[VM] exec: /bin/sh x3 (T1059)'])
+    
+    def test_distinct_events_kept(self):
+        """Test that events differing in details or source are all scored"""
+        from dynamic import ThreatScorer
+        
+        scorer = ThreatScorer()
+        scorer.add_event(_event('exec: /bin/sh'))
+        scorer.add_event(_event('exec: /bin/bash'))
+        scorer.add_event(_event('exec: /bin/sh', source='elf'))
+        
+        self.assertEqual(len(scorer.events), 3)
+        self.assertEqual(scorer.total_score, 30)
+        self.assertTrue(all(e.count == 1 for e in scorer.events))
+        self.assertEqual(scorer.get_reasons()[0], '[VM] exec: /bin/sh (T1059)')
+
+
+class TestAnalysisDB(unittest.TestCase):
+    """Test the analysis result store and its in-memory cache"""
+    
+    def setUp(self):
+        from dynamic import AnalysisDB
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = AnalysisDB(os.path.join(self.tmpdir.name, 'analysis.db'))
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+    
+    def test_lookup_is_cached(self):
+        """Test that a repeated lookup is served from memory"""
+        self.db.save('/tmp/sample', _result('a' * 64, 'SUSPICIOUS', 20))
+        
+        first = self.db.get_by_hash('a' * 64)
+        self.assertEqual(first['verdict'], 'SUSPICIOUS')
+        self.assertEqual(first['reasons'], ['score 20'])
+        self.assertIn('a' * 64, self.db._recent)
+        
+        # Callers may tag the result; the cached copy must not change
+        first['cached'] = True
+        self.assertNotIn('cached', self.db.get_by_hash('a' * 64))
+    
+    def test_save_invalidates_cache(self):
+        """Test that a new result replaces the cached one"""
+        self.db.save('/tmp/sample', _result('b' * 64, 'CLEAN', 0))
+        self.assertEqual(self.db.get_by_hash('b' * 64)['verdict'], 'CLEAN')
+        
+        self.db.save('/tmp/sample', _result('b' * 64, 'MALICIOUS', 80))
+        self.assertNotIn('b' * 64, self.db._recent)
+        self.assertEqual(self.db.get_by_hash('b' * 64)['verdict'], 'MALICIOUS')
+    
+    def test_cache_is_bounded(self):
+        """Test that the least recently used result is evicted"""
+        with mock.patch('dynamic._RESULT_CACHE_SIZE', 2):
+            for c in 'cde':
+                self.db.save('/tmp/sample', _result(c * 64))
+                self.db.get_by_hash(c * 64)
+        
+        self.assertEqual(list(self.db._recent), ['d' * 64, 'e' * 64])
+    
+    def test_missing_hash(self):
+        """Test that unknown hashes are not cached"""
+        self.assertIsNone(self.db.get_by_hash('f' * 64))
+        self.assertEqual(len(self.db._recent), 0)
+
+
+class TestSniffType(unittest.TestCase):
+    """Test file type detection from leading bytes"""
+    
+    @staticmethod
+    def _elf_head(machine: int, big_endian: bool = False) -> bytes:
+        order = 'big' if big_endian else 'little'
+        ident = b'\x7fELF' + bytes([2, 2 if big_endian else 1, 1]) + bytes(9)
+        return ident + (2).to_bytes(2, order) + machine.to_bytes(2, order) + bytes(44)
+    
+    def test_elf_machines(self):
+        """Test ELF machine types"""
+        from dynamic import _sniff_type
+        
+        self.assertEqual(_sniff_type(self._elf_head(0x3E)), 'elf_x64')
+        self.assertEqual(_sniff_type(self._elf_head(0xB7)), 'elf_arm64')
+        self.assertEqual(_sniff_type(self._elf_head(0x08, big_endian=True)), 'elf')
+        self.assertIsNone(_sniff_type(b'\x7fELF\x02\x01'))
+    
+    def test_shebangs(self):
+        """Test interpreter lines"""
+        from dynamic import _sniff_type
+        
+        cases = {
+            b'#!/usr/bin/python3.11\nimport os\n': 'python',
+            b'#!/usr/bin/env -S python3 -u\n': 'python',
+            b'#!/usr/bin/env node\n': 'javascript',
+            b'#! /bin/sh\n': 'shell',
+            b'#!/bin/bash -e\n': 'shell',
+        }
+        for head, expected in cases.items():
+            self.assertEqual(_sniff_type(head), expected, head)
+    
+    def test_unknown(self):
+        """Test content that needs file(1)"""
+        from dynamic import _sniff_type
+        
+        self.assertIsNone(_sniff_type(b'#!/usr/bin/perl\n'))
+        self.assertIsNone(_sniff_type(b'#!\n'))
+        self.assertIsNone(_sniff_type(b'PK\x03\x04'))
+        self.assertIsNone(_sniff_type(b''))
+
+
+class TestYaraCache(unittest.TestCase):
+    """Test the on-disk cache of compiled YARA rules"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, f"yara_cache_{os.getuid()}")
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_private_dir_check(self):
+        """Test that only owner-only real directories count as private"""
+        from dynamic import _is_private_dir
+        
+        os.mkdir(self.cache_dir, 0o700)
+        self.assertTrue(_is_private_dir(self.cache_dir))
+        
+        os.chmod(self.cache_dir, 0o755)
+        self.assertFalse(_is_private_dir(self.cache_dir))
+        
+        link = os.path.join(self.tmpdir.name, 'link')
+        os.chmod(self.cache_dir, 0o700)
+        os.symlink(self.cache_dir, link)
+        self.assertFalse(_is_private_dir(link))
+        self.assertFalse(_is_private_dir(os.path.join(self.tmpdir.name, 'missing')))
+    
+    def _scanner(self):
+        from dynamic import YaraScanner
+        rules_dir = os.path.join(self.tmpdir.name, 'rules')
+        rule_file = os.path.join(rules_dir, 'test.yar')
+        if not os.path.exists(rule_file):
+            os.makedirs(rules_dir)
+            with open(rule_file, 'w') as f:
+                f.write('rule Marker { strings: $a = "MARKER" condition: $a }')
+        with mock.patch('tempfile.tempdir', self.tmpdir.name):
+            return YaraScanner(rules_dir)
+    
+    @unittest.skipUnless(yara, "yara-python not installed")
+    def test_cache_written_to_private_dir(self):
+        """Test that compiled rules are cached and reloaded"""
+        scanner = self._scanner()
+        self.assertTrue(scanner.available)
+        cached = os.listdir(self.cache_dir)
+        self.assertEqual(len(cached), 1)
+        
+        # Unchanged sources reuse the same compiled file
+        self.assertTrue(self._scanner().available)
+        self.assertEqual(os.listdir(self.cache_dir), cached)
+    
+    @unittest.skipUnless(yara, "yara-python not installed")
+    def test_shared_cache_dir_ignored(self):
+        """Test that a cache directory others can write is never used"""
+        os.mkdir(self.cache_dir)
+        os.chmod(self.cache_dir, 0o777)
+        
+        scanner = self._scanner()
+        
+        self.assertTrue(scanner.available)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertTrue(stat.S_IMODE(os.stat(self.cache_dir).st_mode) & stat.S_IWOTH)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -5,6 +5,7 @@ Runs inside the VM to execute and monitor suspicious files
 """
 
 import os
+import re
 import sys
 import json
 import time
@@ -31,6 +32,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# "<src>.<port> > <dst>.<port>:" flow in tcpdump -n -q output
+TCPDUMP_FLOW_RE = re.compile(r'(\S+) > (\S+)')
+
 
 @dataclass
 class SyscallEvent:
@@ -321,13 +325,13 @@ class NetworkMonitor:
             port = 0
             protocol = "tcp"
             
-            for i, part in enumerate(parts):
-                if '>' in part and i > 0:
-                    src = parts[i-1].rsplit('.', 1)[0]
-                    dst_parts = parts[i+1].rstrip(':').rsplit('.', 1)
-                    dst = dst_parts[0]
-                    if len(dst_parts) > 1 and dst_parts[1].isdigit():
-                        port = int(dst_parts[1])
+            flow = TCPDUMP_FLOW_RE.search(line)
+            if flow:
+                src = flow.group(1).rsplit('.', 1)[0]
+                dst_parts = flow.group(2).rstrip(':').rsplit('.', 1)
+                dst = dst_parts[0]
+                if len(dst_parts) > 1 and dst_parts[1].isdigit():
+                    port = int(dst_parts[1])
             
             if 'UDP' in line:
                 protocol = "udp"
@@ -365,10 +369,12 @@ class SandboxAgent:
     
     def _get_file_hash(self, path: str) -> str:
         """Calculate SHA256 hash of file"""
-        h = hashlib.sha256()
         try:
             with open(path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
+                if hasattr(hashlib, 'file_digest'):
+                    return hashlib.file_digest(f, 'sha256').hexdigest()
+                h = hashlib.sha256()
+                for chunk in iter(lambda: f.read(1 << 20), b''):
                     h.update(chunk)
             return h.hexdigest()
         except Exception:
@@ -587,15 +593,20 @@ class SandboxAgent:
             try:
                 with open(self.virtio_path, 'r+b', buffering=0) as port:
                     logger.info("Connected to virtio port")
-                    buffer = b''
+                    buffer = bytearray()
                     
                     while self._running:
                         data = port.read(4096)
                         if data:
                             buffer += data
                             
-                            while b'\n' in buffer:
-                                line, buffer = buffer.split(b'\n', 1)
+                            # Split off every complete line at once, keeping the partial tail
+                            end = buffer.rfind(b'\n')
+                            if end == -1:
+                                continue
+                            lines = buffer[:end]
+                            del buffer[:end + 1]
+                            for line in lines.split(b'\n'):
                                 try:
                                     command = json.loads(line.decode())
                                     response = self.handle_command(command)
@@ -633,7 +644,7 @@ class SandboxAgent:
     
     def _handle_client(self, client: socket.socket):
         """Handle a client connection"""
-        buffer = b''
+        buffer = bytearray()
         try:
             while self._running:
                 data = client.recv(4096)
@@ -641,8 +652,13 @@ class SandboxAgent:
                     break
                 buffer += data
                 
-                while b'\n' in buffer:
-                    line, buffer = buffer.split(b'\n', 1)
+                # Split off every complete line at once, keeping the partial tail
+                end = buffer.rfind(b'\n')
+                if end == -1:
+                    continue
+                lines = buffer[:end]
+                del buffer[:end + 1]
+                for line in lines.split(b'\n'):
                     try:
                         command = json.loads(line.decode())
                         response = self.handle_command(command)